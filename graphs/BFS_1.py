@@ -9,6 +9,7 @@
 # названием очередь, так что новые узлы добавляются в хвост очереди, а старые узлы удаляются из головы очереди.
 
 from abc import ABC, abstractmethod
+from collections import deque
 
 
 class Node(ABC):
@@ -24,6 +25,9 @@ class Node(ABC):
       __eq__(self, other)
           Determines if two nodes are equal or not
 
+      __hash__(self)
+          Returns the hash of the node state, equal nodes must have equal hashes
+
       is_the_solution(self)
           Determines if the current node is the solution of the problem
 
@@ -38,6 +42,10 @@ class Node(ABC):
     def __eq__(self, other):
         pass
 
+    @abstractmethod
+    def __hash__(self):
+        pass
+
     @abstractmethod
     def is_the_solution(self, state):
         pass
@@ -68,6 +76,8 @@ class MazeNode(Node):
       -------
       __eq__(self, other)
           Determines if the current node is the same with the other
+      __hash__(self)
+          Returns the hash of the vertex id, so nodes can be stored in sets
       is_the_solution(self, final_state)
           Checks if the current node is the solution
       extend_node(self)
@@ -100,6 +110,16 @@ class MazeNode(Node):
             return self.value == other.value
         return self.value == other
 
+    def __hash__(self):
+        """
+          Returns the hash of the vertex id, consistent with __eq__
+          Returns
+          -------
+          Integer
+            hash of the vertex id
+        """
+        return hash(self.value)
+
     def is_the_solution(self, final_state):
         """
           Checks if the current node is the solution
@@ -139,9 +159,10 @@ class MazeNode(Node):
         path = []
         current_node = self
         while current_node.parent is not None:
-            path.insert(0, current_node.value)
+            path.append(current_node.value)
             current_node = current_node.parent
-        path.insert(0, current_node.value)
+        path.append(current_node.value)
+        path.reverse()
         return path
 
     def __str__(self):
@@ -178,14 +199,20 @@ class BFS:
           represent the initial state of the problem
       final_state : Node
           represent the final state (target) of the problem
-      frontier : List
-          represents the stack and is initialized with the start node
-      checked_nodes : List
-          represents the list of nodes that have been visited throughout the algorithm execution
+      frontier : Deque
+          represents the queue and is initialized with the start node
+      reached_nodes : Set
+          represents the set of nodes that have been inserted to the frontier or visited,
+          so the membership check for a new node costs O(1)
+      checked_nodes : Set
+          represents the set of nodes that have been visited throughout the algorithm execution;
+          computed on access as reached_nodes without the nodes still in the frontier
       number_of_steps : Integer
           Keep track of the algorithm's number of steps
       path : List
           represents the steps from the initial state to the final state
+      verbose : Boolean
+          print the frontier on each step, turn off for large state spaces
 
       Methods
       -------
@@ -193,7 +220,7 @@ class BFS:
           Insert a new node to the frontier. In this algorithm the frontier is a queue, so each new element is inserted to end of the data structure
 
       remove_from_frontier(self)
-          Remove the first element from the frontier, following the FIFO technic. The removed node is added to the checked_node list
+          Remove the first element from the frontier, following the FIFO technic. The removed node stays in reached_nodes and becomes one of checked_nodes
 
       remove_from_frontier(self)
           check if the frontier is empty
@@ -202,13 +229,26 @@ class BFS:
           Implements the core of algorithm. This method searches, in the search space of the problem, a solution
       """
 
-    def __init__(self, start, final):
+    def __init__(self, start, final, verbose=True):
         self.start_state = start
         self.final_state = final
-        self.frontier = [self.start_state]
-        self.checked_nodes = []
+        self.frontier = deque([self.start_state])
+        self.reached_nodes = {self.start_state}
         self.number_of_steps = 0
         self.path = []
+        self.verbose = verbose
+
+    @property
+    def checked_nodes(self):
+        """
+          The nodes removed from the frontier: every visited node is also in reached_nodes
+
+          Returns
+          -------
+          Set
+            reached_nodes without the nodes that are still in the frontier
+        """
+        return self.reached_nodes.difference(self.frontier)
 
     def insert_to_frontier(self, node):
         """
@@ -220,20 +260,19 @@ class BFS:
               The node of the problem that will be added to the frontier
         """
         self.frontier.append(node)
+        self.reached_nodes.add(node)
 
     def remove_from_frontier(self):
         """
           Remove a node from the beginning of the frontier
-          Then add the removed node to the checked_nodes list
+          The removed node stays in reached_nodes, so it becomes one of checked_nodes
 
           Returns
           -------
           Node
             the first node of the frontier
         """
-        first_node = self.frontier.pop(0)
-        self.checked_nodes.append(first_node)
-        return first_node
+        return self.frontier.popleft()
 
     def frontier_is_empty(self):
         """
@@ -253,54 +292,236 @@ class BFS:
         """
           Is the main algorithm. Search for a solution in the solution space of the problem
           Stops if the frontier is empty, so no solution found or if find a solution.
+
+          Returns
+          -------
+          Node
+            the solution node or None if no solution found
         """
         while True:
 
             self.number_of_steps += 1
 
-            print(f"Step: {self.number_of_steps}, Frontier: {self.frontier} ", end= '\t')
+            if self.verbose:
+                print(f"Step: {self.number_of_steps}, Frontier: {list(self.frontier)} ", end= '\t')
 
             if self.frontier_is_empty():
-                print(f"No Solution Found after {self.number_of_steps} steps!!!")
-                break
+                if self.verbose:
+                    print(f"No Solution Found after {self.number_of_steps} steps!!!")
+                return None
 
             selected_node = self.remove_from_frontier()
-            print(f'slect node for next step: {selected_node.value}')
+            if self.verbose:
+                print(f'slect node for next step: {selected_node.value}')
 
 
 
             # проверить, является ли выбранный узел решением задачи
             if selected_node.is_the_solution(self.final_state):
-                print(f"Solution Found in {self.number_of_steps} steps")
-                print(selected_node)
-                break
+                if self.verbose:
+                    print(f"Solution Found in {self.number_of_steps} steps")
+                    print(selected_node)
+                return selected_node
 
             # нарастить узел
             new_nodes = selected_node.extend_node()
 
             # добавить нарощенные узлы на передний край
-            if len(new_nodes) > 0:
-                for new_node in new_nodes:
-                    if new_node not in self.frontier and new_node not in self.checked_nodes:
-                        self.insert_to_frontier(new_node)
-
-
-graph = {
-    "A": ['S'],
-    "B": ['C', 'D', 'S'],
-    "C": ['B', 'J'],
-    "D": ['B', 'G', 'S'],
-    "E": ['G', 'S'],
-    "F": ['G', 'H'],
-    "G": ['D', 'E', 'F', 'H', 'J'],
-    "H": ['F', 'G', 'I'],
-    "I": ['H', 'J'],
-    "J": ['C', 'G', 'I'],
-    "S": ['A', 'B', 'D', 'E']
-  }
-
-start_node = MazeNode(graph, 'A')
-end_node = MazeNode(graph, 'H')
-print(start_node)
-bfc = BFS(start_node, end_node)
-bfc.search()
\ No newline at end of file
+            # множество reached_nodes заменяет линейный поиск по frontier и checked_nodes
+            for new_node in new_nodes:
+                if new_node not in self.reached_nodes:
+                    self.insert_to_frontier(new_node)
+
+
+class BidirectionalBFS:
+    """
+      This class used to represent the bidirectional Breadth First Search for undirected MazeNode graphs
+
+      Two searches are run at the same time: from the initial state forward and from the final state backward.
+      Each step the smaller frontier is extended by one whole level. When a new node has already been reached
+      by the other search, the two parent chains are joined. If BFS has to extend b^d nodes to find a path
+      of length d, both searches together extend about 2 * b^(d/2) nodes.
+
+      ...
+
+      Attributes
+      ----------
+      start_state : MazeNode
+          represent the initial state of the problem
+      final_state : MazeNode
+          represent the final state (target) of the problem
+      frontiers : Tuple
+          the queues of the forward and the backward searches
+      reached_nodes : Tuple
+          dictionaries vertex id -> (MazeNode, depth) of the forward and the backward searches
+      number_of_expansions : Integer
+          number of nodes that have been extended by both searches
+      verbose : Boolean
+          print the found path
+
+      Methods
+      -------
+      search(self)
+          Implements the core of algorithm, returns the solution node or None
+      _expand_level(self, side)
+          Extend all nodes of the current level of one search, returns the best meeting found
+      _join(self, forward_node, backward_node)
+          Join the forward parent chain with the reversed backward parent chain
+    """
+
+    def __init__(self, start, final, verbose=True):
+        self.start_state = start
+        self.final_state = final
+        self.frontiers = (deque([start]), deque([final]))
+        self.reached_nodes = ({start.value: (start, 0)}, {final.value: (final, 0)})
+        self.number_of_expansions = 0
+        self.verbose = verbose
+
+    def search(self):
+        """
+          Extend the smaller frontier level by level until the searches meet
+
+          Returns
+          -------
+          MazeNode
+            the solution node, its parent chain is the path from the initial state, or None if no solution found
+        """
+        solution = None
+        if self.start_state.value == self.final_state.value:
+            solution = self.start_state
+        while solution is None and self.frontiers[0] and self.frontiers[1]:
+            # 0 - прямой поиск, 1 - обратный
+            side = 0 if len(self.frontiers[0]) <= len(self.frontiers[1]) else 1
+            meeting = self._expand_level(side)
+            if meeting is not None:
+                solution = self._join(*meeting)
+
+        if self.verbose:
+            if solution is None:
+                print(f"No Solution Found after {self.number_of_expansions} expansions!!!")
+            else:
+                print(f"Solution Found after {self.number_of_expansions} expansions")
+                print(solution)
+        return solution
+
+    def _expand_level(self, side):
+        """
+          Extend all nodes of the current level of one search
+
+          Parameters
+          ----------
+          side : Integer
+              0 for the forward search, 1 for the backward search
+
+          Returns
+          -------
+          Tuple
+            the pair (forward node, backward node) of the shortest meeting or None
+        """
+        frontier = self.frontiers[side]
+        reached = self.reached_nodes[side]
+        other_reached = self.reached_nodes[1 - side]
+        best_length = None
+        meeting = None
+        for _ in range(len(frontier)):
+            selected_node = frontier.popleft()
+            depth = reached[selected_node.value][1]
+            self.number_of_expansions += 1
+            for new_node in selected_node.extend_node():
+                if new_node.value in reached:
+                    continue
+                reached[new_node.value] = (new_node, depth + 1)
+                frontier.append(new_node)
+                if new_node.value in other_reached:
+                    other_node, other_depth = other_reached[new_node.value]
+                    # Уровень проходится до конца, чтобы из всех встреч выбрать самую короткую
+                    if best_length is None or depth + 1 + other_depth < best_length:
+                        best_length = depth + 1 + other_depth
+                        meeting = (new_node, other_node) if side == 0 else (other_node, new_node)
+        return meeting
+
+    def _join(self, forward_node, backward_node):
+        """
+          Join the two parent chains: the backward chain is reversed and attached to the forward node
+
+          Returns
+          -------
+          MazeNode
+            the node of the final state with the whole path in its parent chain
+        """
+        node = forward_node
+        backward_node = backward_node.parent
+        while backward_node is not None:
+            next_node = MazeNode(backward_node.graph, backward_node.value)
+            next_node.parent = node
+            node = next_node
+            backward_node = backward_node.parent
+        return node
+
+
+# Пример использования
+if __name__ == "__main__":
+    import random
+    import time
+
+    graph = {
+        "A": ['S'],
+        "B": ['C', 'D', 'S'],
+        "C": ['B', 'J'],
+        "D": ['B', 'G', 'S'],
+        "E": ['G', 'S'],
+        "F": ['G', 'H'],
+        "G": ['D', 'E', 'F', 'H', 'J'],
+        "H": ['F', 'G', 'I'],
+        "I": ['H', 'J'],
+        "J": ['C', 'G', 'I'],
+        "S": ['A', 'B', 'D', 'E']
+      }
+
+    start_node = MazeNode(graph, 'A')
+    end_node = MazeNode(graph, 'H')
+    print(start_node)
+    bfc = BFS(start_node, end_node)
+    bfc.search()
+    BidirectionalBFS(start_node, end_node).search()
+
+
+    # Поиск в большом лабиринте-сетке без вывода шагов
+    side = 300
+    grid = {}
+    for x in range(side):
+        for y in range(side):
+            grid[(x, y)] = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                            if 0 <= x + dx < side and 0 <= y + dy < side]
+
+    start_time = time.time()
+    bfc = BFS(MazeNode(grid, (0, 0)), MazeNode(grid, (side - 1, side - 1)), verbose=False)
+    solution = bfc.search()
+    elapsed_time = time.time() - start_time
+    print(f'Сетка {side}x{side}. Шагов: {bfc.number_of_steps}. Длина пути: {len(solution._find_path()) - 1}. '
+          f'Время в мс:{elapsed_time * 1000:.4f}')
+
+    # Лабиринт с большим ветвлением: у каждой вершины около 6 случайных соседей
+    rnd = random.Random(9)
+    count = 100000
+    maze = {vertex: [] for vertex in range(count)}
+    for vertex in range(count):
+        for _ in range(3):
+            neighbor = rnd.randrange(count)
+            if neighbor != vertex and neighbor not in maze[vertex]:
+                maze[vertex].append(neighbor)
+                maze[neighbor].append(vertex)
+
+    start_time = time.time()
+    bfc = BFS(MazeNode(maze, 0), MazeNode(maze, count - 1), verbose=False)
+    solution = bfc.search()
+    elapsed_time = time.time() - start_time
+    print(f'BFS. Раскрыто узлов: {bfc.number_of_steps}. Длина пути: {len(solution._find_path()) - 1}. '
+          f'Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    bidirectional = BidirectionalBFS(MazeNode(maze, 0), MazeNode(maze, count - 1), verbose=False)
+    solution = bidirectional.search()
+    elapsed_time = time.time() - start_time
+    print(f'Двунаправленный BFS. Раскрыто узлов: {bidirectional.number_of_expansions}. '
+          f'Длина пути: {len(solution._find_path()) - 1}. Время в мс:{elapsed_time * 1000:.4f}')
@@ -8,18 +8,57 @@
 # исследует соседние узлы на текущем уровне перед переходом к узлам следующего уровня. Основной принцип BFS —
 # исследование всех узлов на текущем уровне перед переходом на следующий уровень.
 
+# Генераторы iter_dfs и iter_bfs не печатают вершины, а выдают их по одной (yield). Обход можно остановить
+# в любой момент, просто перестав брать значения, а полный список вершин нигде не строится.
+# Вместо рекурсии используется явный стек, поэтому глубина графа не ограничена лимитом рекурсии Python.
+
 from collections import deque
+from itertools import islice
 
 
-def dfs(graph, start, visited=None):
+def iter_dfs(graph, start, visited=None, with_info=False):
+    '''
+    Поиск в глубину в виде генератора. Порядок вершин тот же, что у рекурсивного dfs.
+    На стеке лежат итераторы по соседям вершин текущего пути - это то, что рекурсия хранила бы в кадрах стека.
+    При with_info=True выдает тройки (вершина, глубина, родитель), иначе только вершины.
+    '''
     if visited is None:
         visited = set()
     visited.add(start)
-    print(start, end=' ')
+    yield (start, 0, None) if with_info else start
+    stack = [(start, iter(graph[start]))]
+    while stack:
+        parent, neighbors = stack[-1]
+        for neighbor in neighbors:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                yield (neighbor, len(stack), parent) if with_info else neighbor
+                stack.append((neighbor, iter(graph[neighbor])))
+                break
+        else:
+            stack.pop()
+
+
+def iter_bfs(graph, start, with_info=False):
+    '''
+    Поиск в ширину в виде генератора. Вершина отмечается посещенной при добавлении в очередь,
+    поэтому каждая вершина попадает в очередь один раз.
+    При with_info=True выдает тройки (вершина, глубина, родитель), иначе только вершины.
+    '''
+    visited = {start}
+    queue = deque([(start, 0, None)])
+    while queue:
+        vertex, depth, parent = queue.popleft()
+        yield (vertex, depth, parent) if with_info else vertex
+        for neighbor in graph[vertex]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append((neighbor, depth + 1, vertex))
+
 
-    for neighbor in graph[start]:
-        if neighbor not in visited:
-            dfs(graph, neighbor, visited)
+def dfs(graph, start, visited=None):
+    for vertex in iter_dfs(graph, start, visited):
+        print(vertex, end=' ')
 
 
 def dfs_iterative(graph, start):
@@ -47,21 +86,33 @@ def bfs(graph, start):
 
 
 # Пример использования
-graph = {
-    'A': ['B', 'C'],
-    'B': ['A', 'D', 'E'],
-    'C': ['A', 'F'],
-    'D': ['B'],
-    'E': ['B', 'F'],
-    'F': ['C', 'E']
-}
-
-print("DFS:")
-dfs(graph, 'A')  # Вывод: A B D E F C
-print()
-print("DFS (итеративный):")
-dfs_iterative(graph, 'A')  # Вывод: A C F E B D
-print()
-print("BFS:")
-bfs(graph, 'A')  # Вывод: A B C D E F
-print()
+if __name__ == "__main__":
+    graph = {
+        'A': ['B', 'C'],
+        'B': ['A', 'D', 'E'],
+        'C': ['A', 'F'],
+        'D': ['B'],
+        'E': ['B', 'F'],
+        'F': ['C', 'E']
+    }
+
+    print("DFS:")
+    dfs(graph, 'A')  # Вывод: A B D E F C
+    print()
+    print("DFS (итеративный):")
+    dfs_iterative(graph, 'A')  # Вывод: A B D E F C
+    print()
+    print("BFS:")
+    bfs(graph, 'A')  # Вывод: A B C D E F
+    print()
+    print("BFS (генератор, с глубиной и родителем):")
+    for vertex, depth, parent in iter_bfs(graph, 'A', with_info=True):
+        print(f'{vertex} (глубина {depth}, родитель {parent})', end='; ')
+    print()
+    print("Первые три вершины DFS:", list(islice(iter_dfs(graph, 'A'), 3)))  # Вывод: ['A', 'B', 'D']
+
+    # Цепочка из миллиона вершин: рекурсивный обход упал бы с RecursionError
+    chain = {vertex: [vertex + 1] for vertex in range(10 ** 6)}
+    chain[10 ** 6] = []
+    last_vertex, depth, _ = deque(iter_dfs(chain, 0, with_info=True), maxlen=1)[0]
+    print(f'Цепочка: последняя вершина {last_vertex}, глубина {depth}')
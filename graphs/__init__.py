@@ -0,0 +1,43 @@
+# Пакет алгоритмов на графах.
+# Подмодули импортируются лениво: "import graphs" ничего не загружает, а graphs.Graph или
+# "from graphs import iter_bfs" импортируют только нужный подмодуль при первом обращении (PEP 562).
+# Примеры использования каждого модуля запускаются командой python -m graphs.<модуль>, например python -m graphs.djkstra,
+# а python -m graphs замеряет время импорта модулей.
+
+import importlib
+
+_exports = {
+    "djkstra": [
+        "Graph", "dijkstra_algorithm", "dijkstra_heap", "shortest_path", "bidirectional_shortest_path", "a_star",
+        "zero_heuristic", "euclidean_heuristic", "great_circle_heuristic", "repair_shortest_paths",
+        "random_graph", "print_result",
+    ],
+    "DFC_and_BFS": ["dfs", "dfs_iterative", "bfs", "iter_dfs", "iter_bfs"],
+    "BFS_1": ["Node", "MazeNode", "BFS", "BidirectionalBFS"],
+    "search_strategies": [
+        "Search", "FIFOFrontier", "LIFOFrontier", "PriorityFrontier", "IterativeDeepeningSearch",
+    ],
+    "csr_graph": ["CSRGraph"],
+    "graph_io": ["read_edge_list", "load_edge_list", "convert_edge_list", "write_binary", "MappedGraph"],
+    "components": ["connected_components", "strongly_connected_components", "topological_sort"],
+    "contraction_hierarchies": ["ContractionHierarchy"],
+    "path_cache": ["ShortestPathCache"],
+    "multi_source": ["multi_source_dijkstra"],
+    "parallel_levels": ["SharedCSR", "parallel_bfs", "sequential_levels"],
+}
+_modules = {name: module for module, names in _exports.items() for name in names}
+
+__all__ = sorted(_modules)
+
+
+def __getattr__(name):
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_modules[name]}", __name__), name)
+    # Следующие обращения берут значение из пространства имен пакета без вызова __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,52 @@
+# Замер времени импорта модулей пакета: python -m graphs
+# Каждый модуль импортируется в отдельном процессе с флагом -X importtime, который печатает в stderr
+# время импорта каждого модуля в микросекундах. Берется накопленное время (cumulative) самого модуля -
+# оно включает все модули, которые он импортирует впервые; из трех запусков берется самый быстрый.
+# Замер не должен включать первую компиляцию в байт-код, но и не должен писать __pycache__ в папку пакета,
+# поэтому пакет копируется во временную папку и компилируется там, а процессы замера запускаются
+# из этой копии с PYTHONDONTWRITEBYTECODE=1.
+
+import compileall
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from . import _exports
+
+# Допустимое время импорта одного модуля. Накопленное время включает __init__ пакета (0,5-1 мс) и модуль
+# array, который сам импортирует collections (около 3 мс); без них не обходится ни один модуль с массивами CSR.
+# Поэтому такие модули занимают 4-6 мс, а разброс между запусками около 1 мс: с порогом 5 мс graph_io
+# то проходил, то нет, хотя его собственный код импортируется за 0,3-0,5 мс. Порог 10 мс оставляет запас
+# на этот разброс и все еще ловит тяжелые зависимости при импорте: например, import ast в начале
+# contraction_hierarchies.py давал 13,5 мс.
+LIMIT_MS = 10.0
+
+
+def import_time(module, directory):
+    "Собственное и накопленное время импорта модуля из папки directory в миллисекундах"
+    environment = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True, cwd=directory, env=environment)
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[0].split(":")[1]) / 1000, int(parts[1]) / 1000
+    raise RuntimeError(f"no importtime line for {module}")
+
+
+print(f"Время импорта модулей пакета (допустимо до {LIMIT_MS} мс вместе с модулями стандартной библиотеки):")
+slow_modules = []
+with tempfile.TemporaryDirectory() as directory:
+    package = os.path.join(directory, __package__)
+    shutil.copytree(os.path.dirname(os.path.abspath(__file__)), package,
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    compileall.compile_dir(package, quiet=1)
+    for module in [__package__] + [f"{__package__}.{name}" for name in _exports]:
+        self_time, cumulative_time = min((import_time(module, directory) for _ in range(3)),
+                                         key=lambda times: times[1])
+        if cumulative_time > LIMIT_MS:
+            slow_modules.append(module)
+        print(f'{module}. Время в мс: {cumulative_time:.4f}, из них сам модуль: {self_time:.4f}')
+print("Медленные модули:", slow_modules if slow_modules else "нет")
@@ -0,0 +1,207 @@
+# Компоненты связности, сильно связные компоненты и топологическая сортировка.
+# Все алгоритмы написаны без рекурсии, поэтому работают на графах любой глубины.
+# Граф можно передать как словарь списков {вершина: [соседи]} (как в DFC_and_BFS.py)
+# или как компактный целочисленный граф CSR с массивами offsets/targets (CSRGraph из csr_graph.py).
+# Внутри вершины всегда переводятся в номера 0..n-1, а результат возвращается в исходных метках.
+#
+# Компоненты связности (неориентированный граф) - система непересекающихся множеств (union-find):
+#   каждое ребро объединяет множества своих концов; с объединением по размеру и сжатием путей
+#   операции выполняются практически за O(1).
+# Сильно связные компоненты (ориентированный граф) - алгоритм Тарьяна: один обход в глубину,
+#   low[v] - наименьший номер вершины, достижимой из поддерева v; вершина с low[v] == index[v] - корень компоненты.
+# Топологическая сортировка (ориентированный граф без циклов) - алгоритм Кана: вершины с нулевой
+#   входящей степенью по очереди удаляются из графа.
+
+from array import array
+from collections import deque
+
+
+def _as_integer_graph(graph):
+    "Возвращает (labels, offsets, targets) - метки вершин и массивы CSR графа"
+    if hasattr(graph, "offsets") and hasattr(graph, "targets"):
+        return graph.labels, graph.offsets, graph.targets
+    labels = list(graph)
+    index = {label: i for i, label in enumerate(labels)}
+    offsets = array('q', [0])
+    targets = array('q')
+    for vertex in list(labels):
+        for neighbor in graph[vertex]:
+            if neighbor not in index:
+                # Вершина встречается только среди соседей - у нее нет исходящих ребер
+                index[neighbor] = len(labels)
+                labels.append(neighbor)
+            targets.append(index[neighbor])
+        offsets.append(len(targets))
+    offsets.extend([len(targets)] * (len(labels) + 1 - len(offsets)))
+    return labels, offsets, targets
+
+
+def connected_components(graph):
+    "Номер компоненты связности для каждой вершины неориентированного графа: {вершина: номер}"
+    labels, offsets, targets = _as_integer_graph(graph)
+    parent = list(range(len(labels)))
+    size = [1] * len(labels)
+
+    for vertex in range(len(labels)):
+        for position in range(offsets[vertex], offsets[vertex + 1]):
+            # Поиск корней со сжатием путей вдвое (path halving)
+            a = vertex
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            b = targets[position]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+            # Меньшее дерево подвешивается к большему
+            if size[a] < size[b]:
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+
+    numbers = {}
+    components = {}
+    for vertex, label in enumerate(labels):
+        root = vertex
+        while parent[root] != root:
+            root = parent[root]
+        components[label] = numbers.setdefault(root, len(numbers))
+    return components
+
+
+def strongly_connected_components(graph):
+    "Список сильно связных компонент ориентированного графа (списки вершин), итеративный алгоритм Тарьяна"
+    labels, offsets, targets = _as_integer_graph(graph)
+    count = len(labels)
+    index = [-1] * count  # Порядковый номер вершины в обходе
+    low = [0] * count
+    on_stack = [False] * count
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        # Вместо рекурсии - стек пар (вершина, позиция следующего непросмотренного ребра)
+        call_stack = [(root, offsets[root])]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while call_stack:
+            vertex, position = call_stack[-1]
+            if position < offsets[vertex + 1]:
+                call_stack[-1] = (vertex, position + 1)
+                neighbor = targets[position]
+                if index[neighbor] == -1:
+                    index[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = True
+                    call_stack.append((neighbor, offsets[neighbor]))
+                elif on_stack[neighbor] and index[neighbor] < low[vertex]:
+                    low[vertex] = index[neighbor]
+                continue
+
+            # Все ребра вершины просмотрены - "возврат из рекурсии"
+            call_stack.pop()
+            if call_stack:
+                parent = call_stack[-1][0]
+                if low[vertex] < low[parent]:
+                    low[parent] = low[vertex]
+            if low[vertex] == index[vertex]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(labels[member])
+                    if member == vertex:
+                        break
+                components.append(component)
+    return components
+
+
+def topological_sort(graph):
+    "Вершины ориентированного графа в топологическом порядке (алгоритм Кана); ValueError, если в графе есть цикл"
+    labels, offsets, targets = _as_integer_graph(graph)
+    in_degree = [0] * len(labels)
+    for target in targets:
+        in_degree[target] += 1
+
+    queue = deque(vertex for vertex in range(len(labels)) if in_degree[vertex] == 0)
+    order = []
+    while queue:
+        vertex = queue.popleft()
+        order.append(labels[vertex])
+        for position in range(offsets[vertex], offsets[vertex + 1]):
+            neighbor = targets[position]
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                queue.append(neighbor)
+
+    if len(order) != len(labels):
+        raise ValueError("graph has a cycle")
+    return order
+
+
+# Пример использования
+if __name__ == "__main__":
+    import random
+    import time
+
+    graph = {
+        'A': ['B', 'C'],
+        'B': ['A', 'D', 'E'],
+        'C': ['A', 'F'],
+        'D': ['B'],
+        'E': ['B', 'F'],
+        'F': ['C', 'E'],
+        'G': ['H'],
+        'H': ['G'],
+    }
+    print("Компоненты связности:", connected_components(graph))  # A-F - компонента 0, G и H - компонента 1
+
+    directed_graph = {
+        'shirt': ['tie', 'belt'],
+        'tie': ['jacket'],
+        'trousers': ['shoes', 'belt'],
+        'belt': ['jacket'],
+        'socks': ['shoes'],
+        'shoes': [],
+        'jacket': [],
+    }
+    print("Топологический порядок:", topological_sort(directed_graph))
+    print("Сильно связные компоненты:", strongly_connected_components({1: [2], 2: [3], 3: [1, 4], 4: [5], 5: [4]}))
+    # Вывод: [[5, 4], [3, 2, 1]]
+
+    # Замеры на случайных графах с 10^6 вершин и 1.5 * 10^6 ребер
+    count = 10 ** 6
+    rnd = random.Random(11)
+    undirected = {vertex: [] for vertex in range(count)}
+    dag = {vertex: [] for vertex in range(count)}
+    for _ in range(3 * count // 2):
+        u, v = rnd.randrange(count), rnd.randrange(count)
+        if u == v:
+            continue
+        undirected[u].append(v)
+        undirected[v].append(u)
+        # Ребра от меньшего номера к большему - циклов нет
+        dag[min(u, v)].append(max(u, v))
+
+    start_time = time.time()
+    components = connected_components(undirected)
+    elapsed_time = time.time() - start_time
+    print(f'Компоненты связности. Компонент: {len(set(components.values()))}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    strong_components = strongly_connected_components(undirected)
+    elapsed_time = time.time() - start_time
+    print(f'Сильно связные компоненты. Компонент: {len(strong_components)}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    order = topological_sort(dag)
+    elapsed_time = time.time() - start_time
+    print(f'Топологическая сортировка. Вершин: {len(order)}. Время в мс:{elapsed_time * 1000:.4f}')
@@ -0,0 +1,328 @@
+# Иерархии сжатия (contraction hierarchies) — ускорение многократных запросов кратчайшего пути в неизменном графе.
+# Предварительная обработка: узлы по одному "сжимаются" (удаляются из графа) в порядке важности.
+# Если после удаления узла v кратчайший путь u -> v -> w пропадает, добавляется ребро-ярлык (shortcut) u -> w
+# с тем же значением. Перед добавлением запускается короткий поиск-свидетель (witness search): если есть
+# другой путь u -> w не длиннее, ярлык не нужен. Узел получает ранг - номер в порядке сжатия.
+# Запрос: двунаправленный Дейкстра, в котором оба поиска идут только "вверх" - к узлам с большим рангом.
+# Кратчайший путь всегда можно записать как подъем от source и спуск к target, поэтому такие поиски
+# встречаются в узле с наибольшим рангом на пути и просматривают лишь несколько сотен узлов даже в огромном графе.
+# Обработка выполняется один раз, результат сохраняется на диск и загружается сервисом запросов.
+#
+# Двоичный формат файла, по образцу graph_io.py:
+#   заголовок 40 байт: сигнатура b'CHIE', тип значений ребер (b'q' - целые, b'd' - дробные),
+#                      вид меток (b'q' - целые, b'r' - запись repr), 2 пустых байта,
+#                      версия формата, число узлов, число ребер и размер записи меток в байтах (int64);
+#   offsets: (число узлов + 1) * int64, targets, weights, middles: число ребер * 8 байт;
+#   метки: массив int64 или текст repr(список меток) в UTF-8, который читается ast.literal_eval.
+# В отличие от pickle, при загрузке не выполняется код из файла: метками могут быть только литералы Python -
+# числа, строки и кортежи из них.
+
+import heapq
+import mmap
+import struct
+import sys
+from array import array
+
+MAGIC = b'CHIE'
+VERSION = 1
+HEADER = struct.Struct('<4scc2xqqqq')
+
+
+class ContractionHierarchy:
+    """Иерархия сжатия неориентированного графа: ребра "вверх" в формате CSR и ярлыки для восстановления пути"""
+
+    def __init__(self, labels, offsets, targets, weights, middles):
+        self.labels = labels  # Номер узла -> метка, номер совпадает с рангом
+        self.index = {label: i for i, label in enumerate(labels)}  # Метка -> номер узла
+        self.offsets = offsets  # Начало списка ребер "вверх" каждого узла
+        self.targets = targets  # Концы ребер - всегда узлы с большим рангом
+        self.weights = weights  # Значения ребер
+        self.middles = middles  # Сжатый узел, через который проходит ярлык, или -1 для ребра исходного графа
+
+    @classmethod
+    def build(cls, graph, witness_limit=50):
+        '''
+        Предварительная обработка графа с интерфейсом Graph (get_nodes, neighbors).
+        witness_limit ограничивает число узлов, просматриваемых поиском-свидетелем: если свидетель не найден
+        за это число шагов, ярлык добавляется на всякий случай - лишний ярлык не нарушает правильность ответов.
+        '''
+        labels = list(graph.get_nodes())
+        index = {label: i for i, label in enumerate(labels)}
+        # Оставшийся (еще не сжатый) граф: узел -> {сосед: (значение, средний узел ярлыка)}
+        adjacency = [{} for _ in labels]
+        for label in labels:
+            i = index[label]
+            for neighbor, value in graph.neighbors(label):
+                j = index[neighbor]
+                if i != j and value < adjacency[i].get(j, (sys.maxsize,))[0]:
+                    adjacency[i][j] = (value, -1)
+                    adjacency[j][i] = (value, -1)
+
+        # Разность ребер (ярлыки минус удаленные ребра) запоминается для каждого узла. Сжатие меняет ребра
+        # только у соседей сжатого узла, поэтому поиски-свидетели повторяются лишь для них (отмеченных в stale)
+        edge_difference = [cls._edge_difference(adjacency, v, witness_limit) for v in range(len(labels))]
+        stale = [False] * len(labels)
+        contracted_neighbors = [0] * len(labels)
+        heap = [(edge_difference[v], v) for v in range(len(labels))]
+        heapq.heapify(heap)
+
+        order = []
+        upward = [None] * len(labels)
+        while heap:
+            _, v = heapq.heappop(heap)
+            # Ленивое обновление: приоритет соседа сжатого узла пересчитывается, когда он достается из кучи
+            if stale[v]:
+                edge_difference[v] = cls._edge_difference(adjacency, v, witness_limit)
+                stale[v] = False
+                priority = edge_difference[v] + contracted_neighbors[v]
+                if heap and priority > heap[0][0]:
+                    heapq.heappush(heap, (priority, v))
+                    continue
+
+            for u, w, value in cls._shortcuts(adjacency, v, witness_limit):
+                if value < adjacency[u].get(w, (sys.maxsize,))[0]:
+                    adjacency[u][w] = (value, v)
+                    adjacency[w][u] = (value, v)
+            # Все оставшиеся соседи сжимаются позже, поэтому ребра к ним ведут "вверх"
+            upward[v] = adjacency[v]
+            for u in adjacency[v]:
+                del adjacency[u][v]
+                contracted_neighbors[u] += 1
+                stale[u] = True
+            adjacency[v] = {}
+            order.append(v)
+
+        # Перенумеровываем узлы по рангу и упаковываем ребра "вверх" в массивы
+        rank = [0] * len(labels)
+        for position, v in enumerate(order):
+            rank[v] = position
+        is_integer = all(isinstance(value, int) for edges in upward for value, _ in edges.values())
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('q' if is_integer else 'd')
+        middles = array('q')
+        for v in order:
+            for u, (value, middle) in upward[v].items():
+                targets.append(rank[u])
+                weights.append(value)
+                middles.append(rank[middle] if middle >= 0 else -1)
+            offsets.append(len(targets))
+        return cls([labels[v] for v in order], offsets, targets, weights, middles)
+
+    @staticmethod
+    def _shortcuts(adjacency, v, witness_limit):
+        "Ярлыки (u, w, значение), которые нужны при сжатии узла v"
+        neighbors = list(adjacency[v].items())
+        shortcuts = []
+        for position, (u, (value_u, _)) in enumerate(neighbors):
+            others = neighbors[position + 1:]
+            if not others:
+                continue
+            limit = value_u + max(value_w for _, (value_w, _) in others)
+            witness = ContractionHierarchy._witness_search(adjacency, u, v, limit, witness_limit)
+            for w, (value_w, _) in others:
+                if witness.get(w, sys.maxsize) > value_u + value_w:
+                    shortcuts.append((u, w, value_u + value_w))
+        return shortcuts
+
+    @staticmethod
+    def _witness_search(adjacency, source, excluded, limit, witness_limit):
+        "Ограниченный Дейкстра от source в оставшемся графе без узла excluded"
+        distances = {source: 0}
+        visited = set()
+        heap = [(0, source)]
+        while heap and len(visited) < witness_limit:
+            current_value, current_node = heapq.heappop(heap)
+            if current_value > limit:
+                break
+            if current_node in visited:
+                continue
+            visited.add(current_node)
+            for neighbor, (value, _) in adjacency[current_node].items():
+                if neighbor == excluded:
+                    continue
+                tentative_value = current_value + value
+                if tentative_value < distances.get(neighbor, sys.maxsize):
+                    distances[neighbor] = tentative_value
+                    heapq.heappush(heap, (tentative_value, neighbor))
+        return distances
+
+    @staticmethod
+    def _edge_difference(adjacency, v, witness_limit):
+        "Разность ребер: число ярлыков при сжатии v минус число удаляемых ребер; приоритет - она плюс число сжатых соседей"
+        return len(ContractionHierarchy._shortcuts(adjacency, v, witness_limit)) - len(adjacency[v])
+
+    def save(self, path):
+        "Сохраняет иерархию в двоичный файл"
+        import ast  # Модуль ast импортируется долго (около 7 мс), а нужен только при сохранении и загрузке
+
+        if all(type(label) is int for label in self.labels):
+            label_kind, label_data = b'q', array('q', self.labels).tobytes()
+        else:
+            label_kind, label_data = b'r', repr(list(self.labels)).encode()
+            try:
+                readable = ast.literal_eval(label_data.decode()) == list(self.labels)
+            except (ValueError, SyntaxError):
+                readable = False
+            if not readable:
+                raise TypeError("labels must be Python literals: numbers, strings and tuples of them")
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, self.weights.typecode.encode(), label_kind, VERSION,
+                                   len(self.labels), len(self.targets), len(label_data)))
+            for part in (self.offsets, self.targets, self.weights, self.middles):
+                part.tofile(file)
+            file.write(label_data)
+
+    @classmethod
+    def load(cls, path):
+        "Загружает иерархию, сохраненную методом save; для чужого или усеченного файла - ValueError"
+        import ast
+
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            if len(mapping) < HEADER.size:
+                raise ValueError(f"{path} is not a contraction hierarchy file")
+            magic, typecode, label_kind, version, nodes_count, edges_count, labels_size = HEADER.unpack_from(mapping)
+            if magic != MAGIC or version != VERSION or label_kind not in (b'q', b'r'):
+                raise ValueError(f"{path} is not a contraction hierarchy file")
+            sizes = [8 * (nodes_count + 1), 8 * edges_count, 8 * edges_count, 8 * edges_count, labels_size]
+            if min(nodes_count, edges_count, labels_size) < 0 or HEADER.size + sum(sizes) > len(mapping):
+                raise ValueError(f"{path} is truncated")
+            parts = []
+            start = HEADER.size
+            with memoryview(mapping) as buffer:
+                for code, size in zip(('q', 'q', typecode.decode(), 'q'), sizes):
+                    part = array(code)
+                    part.frombytes(buffer[start:start + size])
+                    parts.append(part)
+                    start += size
+                label_data = bytes(buffer[start:start + labels_size])
+        if label_kind == b'q':
+            labels = array('q', label_data).tolist()
+        else:
+            labels = ast.literal_eval(label_data.decode())
+        return cls(labels, *parts)
+
+    def _upward_search(self, source):
+        "Дейкстра от source только по ребрам вверх; возвращает расстояния и предыдущие узлы"
+        distances = {source: 0}
+        previous_nodes = {}
+        heap = [(0, source)]
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        while heap:
+            current_value, current_node = heapq.heappop(heap)
+            if current_value > distances[current_node]:
+                continue
+            for position in range(offsets[current_node], offsets[current_node + 1]):
+                neighbor = targets[position]
+                tentative_value = current_value + weights[position]
+                if tentative_value < distances.get(neighbor, sys.maxsize):
+                    distances[neighbor] = tentative_value
+                    previous_nodes[neighbor] = current_node
+                    heapq.heappush(heap, (tentative_value, neighbor))
+        return distances, previous_nodes
+
+    def _query(self, source, target):
+        "Поиски вверх от source и от target и лучший узел встречи"
+        forward, forward_previous = self._upward_search(source)
+        backward, backward_previous = self._upward_search(target)
+        best_value, meeting_node = sys.maxsize, None
+        for node, value in backward.items():
+            if node in forward and forward[node] + value < best_value:
+                best_value, meeting_node = forward[node] + value, node
+        return best_value, meeting_node, forward_previous, backward_previous
+
+    def distance(self, source, target):
+        "Значение кратчайшего пути между двумя метками, sys.maxsize если пути нет"
+        return self._query(self.index[source], self.index[target])[0]
+
+    def shortest_path(self, source, target):
+        "Пара (значение пути, список узлов пути) с раскрытием ярлыков в ребра исходного графа"
+        source, target = self.index[source], self.index[target]
+        best_value, meeting_node, forward_previous, backward_previous = self._query(source, target)
+        if meeting_node is None:
+            return sys.maxsize, []
+        nodes = [meeting_node]
+        while nodes[-1] != source:
+            nodes.append(forward_previous[nodes[-1]])
+        nodes.reverse()
+        while nodes[-1] != target:
+            nodes.append(backward_previous[nodes[-1]])
+
+        path = [nodes[0]]
+        for u, w in zip(nodes, nodes[1:]):
+            path.extend(self._unpack(u, w))
+        return best_value, [self.labels[node] for node in path]
+
+    def _edge(self, u, w):
+        "Позиция ребра u -> w (u ниже по рангу) в массивах"
+        for position in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[position] == w:
+                return position
+        raise KeyError((self.labels[u], self.labels[w]))
+
+    def _unpack(self, u, w):
+        "Раскрывает ребро или ярлык между u и w в последовательность узлов исходного графа (без u)"
+        result = []
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            low, high = (a, b) if a < b else (b, a)
+            middle = self.middles[self._edge(low, high)]
+            if middle < 0:
+                result.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return result
+
+
+# Пример использования
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+
+    from .djkstra import Graph, dijkstra_heap
+
+    print()
+    print("Иерархии сжатия")
+    # Иерархии хорошо работают на графах, похожих на дорожную сеть, поэтому для примера берем сетку
+    side = 50
+    rnd = random.Random(4)
+    grid_nodes = [(x, y) for x in range(side) for y in range(side)]
+    grid = {node: {} for node in grid_nodes}
+    for x, y in grid_nodes:
+        for neighbor in ((x + 1, y), (x, y + 1)):
+            if neighbor in grid:
+                grid[(x, y)][neighbor] = rnd.randint(1, 100)
+    graph = Graph(grid_nodes, grid)
+
+    start_time = time.time()
+    hierarchy = ContractionHierarchy.build(graph)
+    elapsed_time = time.time() - start_time
+    print(f'Предварительная обработка. Узлов: {len(grid_nodes)}. Ребер вверх и ярлыков: {len(hierarchy.targets)}. '
+          f'Время в мс:{elapsed_time * 1000:.4f}')
+
+    path = os.path.join(tempfile.gettempdir(), "contraction_hierarchy.bin")
+    hierarchy.save(path)
+    hierarchy = ContractionHierarchy.load(path)
+    os.remove(path)
+
+    sources = [rnd.choice(grid_nodes) for _ in range(10)]
+    targets = [rnd.choice(grid_nodes) for _ in range(100)]
+    queries = [(source, target) for source in sources for target in targets]
+
+    start_time = time.time()
+    expected = {source: dijkstra_heap(graph, source)[1] for source in sources}
+    elapsed_time = time.time() - start_time
+    print(f'Дейкстра. Запросов: {len(sources)}. Время в мс на запрос:{elapsed_time * 1000 / len(sources):.4f}')
+
+    start_time = time.time()
+    values = [hierarchy.distance(source, target) for source, target in queries]
+    elapsed_time = time.time() - start_time
+    print(f'Иерархия сжатия. Запросов: {len(queries)}. Время в мс на запрос:{elapsed_time * 1000 / len(queries):.4f}')
+
+    print("Расстояния совпадают:", values == [expected[source][target] for source, target in queries])
+    value, route = hierarchy.shortest_path(*queries[0])
+    print("Путь совпадает по значению:", value == sum(graph.value(u, w) for u, w in zip(route, route[1:])))
@@ -0,0 +1,205 @@
+# Сжатое хранение строк (CSR, compressed sparse row) — компактный способ хранить разреженный граф.
+# Вместо словаря словарей каждая вершина получает целый номер, а все ребра лежат подряд в трех массивах:
+#   offsets — для вершины i ее ребра занимают позиции с offsets[i] по offsets[i + 1] - 1;
+#   targets — номера концов ребер;
+#   weights — значения (веса) ребер.
+# Массивы модуля array хранят числа без отдельных Python-объектов, поэтому на ребро уходит около 16 байт —
+# в разы меньше, чем в словаре, а соседи вершины лежат в памяти рядом.
+# Класс CSRGraph повторяет интерфейс Graph из djkstra.py (get_nodes, get_outgoing_edges, value, neighbors)
+# и словаря списков (graph[vertex]), поэтому dijkstra_algorithm, bfs, dfs_iterative и BFS работают с ним без изменений.
+
+import sys
+from array import array
+
+
+class CSRGraph:
+    """Граф в формате CSR с отображением меток вершин в целые номера"""
+
+    def __init__(self, labels, offsets, targets, weights):
+        self.labels = labels  # Номер вершины -> метка
+        self.index = {label: i for i, label in enumerate(labels)}  # Метка -> номер вершины
+        self.offsets = offsets  # Начало списка ребер каждой вершины, длина V + 1
+        self.targets = targets  # Номера концов ребер, длина E
+        self.weights = weights  # Веса ребер, длина E
+
+    @classmethod
+    def from_init_graph(cls, nodes, init_graph, symmetric=True):
+        '''
+        Строит граф из формата init_graph (словарь словарей {узел: {сосед: значение}}), как в djkstra.py.
+        При symmetric=True, как и Graph.construct_graph, добавляет обратное ребро с тем же значением.
+        '''
+        labels = list(nodes)
+        index = {label: i for i, label in enumerate(labels)}
+        for node in init_graph:
+            if node not in index:
+                index[node] = len(labels)
+                labels.append(node)
+
+        rows = [{} for _ in labels]
+        for node, edges in init_graph.items():
+            for adjacent_node, value in edges.items():
+                if adjacent_node not in index:
+                    index[adjacent_node] = len(labels)
+                    labels.append(adjacent_node)
+                    rows.append({})
+                rows[index[node]][index[adjacent_node]] = value
+        if symmetric:
+            for i in range(len(rows)):
+                for j, value in list(rows[i].items()):
+                    rows[j].setdefault(i, value)
+        return cls._from_rows(labels, [list(row.items()) for row in rows])
+
+    @classmethod
+    def from_adjacency(cls, graph):
+        "Строит граф из словаря списков {вершина: [соседи]}, как в DFC_and_BFS.py и BFS_1.py. Вес ребер равен 1."
+        labels = list(graph)
+        index = {label: i for i, label in enumerate(labels)}
+        rows = []
+        for vertex in list(labels):
+            row = []
+            for neighbor in graph[vertex]:
+                if neighbor not in index:
+                    index[neighbor] = len(labels)
+                    labels.append(neighbor)
+                row.append((index[neighbor], 1))
+            rows.append(row)
+        rows.extend([] for _ in range(len(labels) - len(rows)))
+        return cls._from_rows(labels, rows)
+
+    @classmethod
+    def _from_rows(cls, labels, rows):
+        "Упаковывает списки пар (номер соседа, вес) в массивы offsets/targets/weights"
+        is_integer = all(isinstance(value, int) for row in rows for _, value in row)
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('q' if is_integer else 'd')
+        for row in rows:
+            for target, value in row:
+                targets.append(target)
+                weights.append(value)
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets, weights)
+
+    def __len__(self):
+        "Количество вершин"
+        return len(self.labels)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __getitem__(self, node):
+        "Список соседей вершины, как в словаре списков graph[vertex]"
+        i = self.index[node]
+        labels = self.labels
+        return [labels[j] for j in self.targets[self.offsets[i]:self.offsets[i + 1]]]
+
+    def edges_count(self):
+        "Количество ребер (для неориентированного графа каждое ребро учитывается дважды)"
+        return len(self.targets)
+
+    def get_nodes(self):
+        "Возвращает узлы графа"
+        return self.labels
+
+    def get_outgoing_edges(self, node):
+        "Возвращает соседей узла"
+        return self[node]
+
+    def neighbors(self, node):
+        "Возвращает пары (сосед, значение ребра)"
+        i = self.index[node]
+        start, end = self.offsets[i], self.offsets[i + 1]
+        labels = self.labels
+        return [(labels[j], value) for j, value in zip(self.targets[start:end], self.weights[start:end])]
+
+    def neighbor_ids(self, i):
+        "Номера соседей вершины с номером i - срез массива без перевода в метки"
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def value(self, node1, node2):
+        "Возвращает значение ребра между двумя узлами"
+        i, j = self.index[node1], self.index[node2]
+        for position in range(self.offsets[i], self.offsets[i + 1]):
+            if self.targets[position] == j:
+                return self.weights[position]
+        raise KeyError(node2)
+
+    def nbytes(self):
+        "Размер буферов offsets/targets/weights в байтах"
+        return sum(buffer.itemsize * len(buffer) for buffer in (self.offsets, self.targets, self.weights))
+
+
+def dict_graph_size(graph):
+    "Грубая оценка памяти словаря словарей или словаря списков (без учета самих меток)"
+    total = sys.getsizeof(graph)
+    for edges in graph.values():
+        total += sys.getsizeof(edges)
+    return total
+
+
+# Пример использования
+if __name__ == "__main__":
+    from .DFC_and_BFS import bfs, dfs_iterative
+    from .BFS_1 import BFS, MazeNode
+    from .djkstra import dijkstra_algorithm, dijkstra_heap, print_result, random_graph
+
+    print()
+    print("CSR граф")
+
+    nodes = ["Reykjavik", "Oslo", "Moscow", "London", "Rome", "Berlin", "Belgrade", "Athens"]
+    init_graph = {node: {} for node in nodes}
+    init_graph["Reykjavik"]["Oslo"] = 5
+    init_graph["Reykjavik"]["London"] = 4
+    init_graph["Oslo"]["Berlin"] = 1
+    init_graph["Oslo"]["Moscow"] = 3
+    init_graph["Moscow"]["Belgrade"] = 5
+    init_graph["Moscow"]["Athens"] = 4
+    init_graph["Athens"]["Belgrade"] = 1
+    init_graph["Rome"]["Berlin"] = 2
+    init_graph["Rome"]["Athens"] = 2
+
+    csr_graph = CSRGraph.from_init_graph(nodes, init_graph)
+    previous_nodes, shortest_path = dijkstra_algorithm(graph=csr_graph, start_node="Reykjavik")
+    print_result(previous_nodes, shortest_path, start_node="Reykjavik", target_node="Belgrade")
+
+    graph = {
+        'A': ['B', 'C'],
+        'B': ['A', 'D', 'E'],
+        'C': ['A', 'F'],
+        'D': ['B'],
+        'E': ['B', 'F'],
+        'F': ['C', 'E']
+    }
+    csr_graph = CSRGraph.from_adjacency(graph)
+    print("DFS (итеративный):")
+    dfs_iterative(csr_graph, 'A')  # Вывод: A B D E F C
+    print()
+    print("BFS:")
+    bfs(csr_graph, 'A')  # Вывод: A B C D E F
+    print()
+
+    maze = CSRGraph.from_adjacency({
+        "A": ['S'],
+        "B": ['C', 'D', 'S'],
+        "C": ['B', 'J'],
+        "D": ['B', 'G', 'S'],
+        "E": ['G', 'S'],
+        "F": ['G', 'H'],
+        "G": ['D', 'E', 'F', 'H', 'J'],
+        "H": ['F', 'G', 'I'],
+        "I": ['H', 'J'],
+        "J": ['C', 'G', 'I'],
+        "S": ['A', 'B', 'D', 'E']
+    })
+    BFS(MazeNode(maze, 'A'), MazeNode(maze, 'H')).search()
+
+    # Сравнение памяти на большом случайном графе
+    big_graph = random_graph(100000, 5, seed=1)
+    big_csr = CSRGraph.from_init_graph(big_graph.get_nodes(), big_graph.graph, symmetric=False)
+    edges = big_csr.edges_count()
+    print(f'Ребер: {edges}. Словарь словарей, байт на ребро: {dict_graph_size(big_graph.graph) / edges:.1f}')
+    print(f'Ребер: {edges}. CSR, байт на ребро: {big_csr.nbytes() / edges:.1f}')
+    print("Расстояния совпадают:", dijkstra_heap(big_graph, "N0")[1] == dijkstra_heap(big_csr, "N0")[1])
@@ -3,13 +3,16 @@
 # (без рёбер с отрицательной "длиной").
 
 
+import heapq
+import math
 import sys
 
 
 class Graph(object):
     def __init__(self, nodes, init_graph):
-        self.nodes = nodes
+        self.nodes = list(nodes)
         self.graph = self.construct_graph(nodes, init_graph)
+        self.version = 0  # Увеличивается при каждом изменении ребер, по нему кэши узнают об устаревании
 
     def construct_graph(self, nodes, init_graph):
         '''
@@ -42,10 +45,30 @@ class Graph(object):
                 connections.append(out_node)
         return connections
 
+    def neighbors(self, node):
+        "Возвращает пары (сосед, значение ребра) прямо из списка смежности узла"
+        return self.graph[node].items()
+
     def value(self, node1, node2):
         "Возвращает значение ребра между двумя узлами."
         return self.graph[node1][node2]
 
+    def update_edge(self, node1, node2, value):
+        "Добавляет ребро или меняет его значение в обе стороны, сохраняя симметричность графа"
+        for node in (node1, node2):
+            if node not in self.graph:
+                self.nodes.append(node)
+                self.graph[node] = {}
+        self.graph[node1][node2] = value
+        self.graph[node2][node1] = value
+        self.version += 1
+
+    def remove_edge(self, node1, node2):
+        "Удаляет ребро между двумя узлами в обе стороны"
+        del self.graph[node1][node2]
+        del self.graph[node2][node1]
+        self.version += 1
+
 
 def dijkstra_algorithm(graph, start_node):
     unvisited_nodes = list(graph.get_nodes())
@@ -89,6 +112,281 @@ def dijkstra_algorithm(graph, start_node):
     return previous_nodes, shortest_path
 
 
+def dijkstra_heap(graph, start_node):
+    '''
+    Алгоритм Дейкстры на двоичной куче (heapq) с "ленивым" удалением.
+    Вместо поиска минимума линейным проходом по непосещенным узлам берем его из кучи за O(log V).
+    Уменьшение ключа не поддерживается heapq, поэтому при улучшении расстояния в кучу просто кладется
+    новая пара (расстояние, узел), а устаревшие пары пропускаются при извлечении.
+    Сложность O((V + E) log V) вместо O(V^2). Возвращает тот же результат, что и dijkstra_algorithm.
+    '''
+    max_value = sys.maxsize
+    shortest_path = {node: max_value for node in graph.get_nodes()}
+    shortest_path[start_node] = 0
+    previous_nodes = {}
+
+    visited = set()
+    heap = [(0, start_node)]
+    while heap:
+        current_value, current_node = heapq.heappop(heap)
+        # Узел уже был извлечен с меньшим расстоянием - это устаревшая запись
+        if current_node in visited:
+            continue
+        visited.add(current_node)
+
+        for neighbor, edge_value in graph.neighbors(current_node):
+            tentative_value = current_value + edge_value
+            if tentative_value < shortest_path[neighbor]:
+                shortest_path[neighbor] = tentative_value
+                previous_nodes[neighbor] = current_node
+                heapq.heappush(heap, (tentative_value, neighbor))
+
+    return previous_nodes, shortest_path
+
+
+def _build_path(previous_nodes, source, target):
+    "Восстанавливает путь от source до target по словарю предыдущих узлов"
+    path = [target]
+    while path[-1] != source:
+        path.append(previous_nodes[path[-1]])
+    path.reverse()
+    return path
+
+
+def shortest_path(graph, source, target):
+    '''
+    Кратчайший путь между двумя узлами. Это тот же dijkstra_heap, но поиск останавливается,
+    как только из кучи извлечен target: его расстояние уже окончательное, а остальные узлы не нужны.
+    Возвращает пару (значение пути, список узлов пути). Если путь не существует - (sys.maxsize, []).
+    '''
+    shortest = {source: 0}
+    previous_nodes = {}
+    visited = set()
+    heap = [(0, source)]
+    while heap:
+        current_value, current_node = heapq.heappop(heap)
+        if current_node in visited:
+            continue
+        if current_node == target:
+            return current_value, _build_path(previous_nodes, source, target)
+        visited.add(current_node)
+
+        for neighbor, edge_value in graph.neighbors(current_node):
+            tentative_value = current_value + edge_value
+            if tentative_value < shortest.get(neighbor, sys.maxsize):
+                shortest[neighbor] = tentative_value
+                previous_nodes[neighbor] = current_node
+                heapq.heappush(heap, (tentative_value, neighbor))
+
+    return sys.maxsize, []
+
+
+def bidirectional_shortest_path(graph, source, target, reverse_graph=None):
+    '''
+    Двунаправленный алгоритм Дейкстры: два поиска идут навстречу друг другу - прямой от source
+    и обратный от target. Каждый шаг расширяется тот поиск, у которого меньше минимальное расстояние в куче.
+    Лучший найденный путь запоминается в момент, когда ребро соединяет узлы, достигнутые обоими поисками.
+    Поиск останавливается, когда сумма минимумов двух куч не меньше лучшего пути - короче путь уже не найти.
+    Оба поиска обходят примерно по "кругу" половинного радиуса, поэтому узлов просматривается заметно меньше.
+    Для ориентированного графа нужно передать reverse_graph с развернутыми ребрами,
+    для симметричного графа обратный поиск идет по тому же графу.
+    Возвращает пару (значение пути, список узлов пути). Если путь не существует - (sys.maxsize, []).
+    '''
+    if source == target:
+        return 0, [source]
+    if reverse_graph is None:
+        reverse_graph = graph
+
+    graphs = (graph, reverse_graph)
+    shortest = ({source: 0}, {target: 0})
+    previous_nodes = ({}, {})
+    visited = (set(), set())
+    heaps = ([(0, source)], [(0, target)])
+
+    best_value = sys.maxsize
+    meeting_node = None
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best_value:
+            break
+        # 0 - прямой поиск, 1 - обратный
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        current_value, current_node = heapq.heappop(heaps[side])
+        if current_node in visited[side]:
+            continue
+        visited[side].add(current_node)
+
+        other_shortest = shortest[1 - side]
+        for neighbor, edge_value in graphs[side].neighbors(current_node):
+            tentative_value = current_value + edge_value
+            if tentative_value < shortest[side].get(neighbor, sys.maxsize):
+                shortest[side][neighbor] = tentative_value
+                previous_nodes[side][neighbor] = current_node
+                heapq.heappush(heaps[side], (tentative_value, neighbor))
+            if neighbor in other_shortest:
+                total_value = shortest[side][neighbor] + other_shortest[neighbor]
+                if total_value < best_value:
+                    best_value = total_value
+                    meeting_node = neighbor
+
+    if meeting_node is None:
+        return sys.maxsize, []
+    path = _build_path(previous_nodes[0], source, meeting_node)
+    backward_path = _build_path(previous_nodes[1], target, meeting_node)
+    path.extend(reversed(backward_path[:-1]))
+    return best_value, path
+
+
+def a_star(graph, start_node, target_node, heuristic):
+    '''
+    Алгоритм A*. Это Дейкстра, у которой узлы в куче упорядочены не по пройденному расстоянию g(n),
+    а по оценке полного пути f(n) = g(n) + heuristic(n, target_node). Эвристика подсказывает, в какой стороне цель,
+    поэтому узлы "позади" начального почти не раскрываются.
+    Эвристика должна быть допустимой - никогда не превышать настоящее расстояние до цели,
+    иначе найденный путь может оказаться не кратчайшим. С эвристикой, равной нулю, A* совпадает с Дейкстрой.
+    Множества закрытых узлов нет: если к уже раскрытому узлу найден более короткий путь, узел раскрывается снова.
+    Для допустимой, но не согласованной эвристики (h(u) > value(u, v) + h(v) для какого-то ребра) это нужно,
+    чтобы путь остался кратчайшим; для согласованной повторных раскрытий не бывает.
+    Возвращает previous_nodes и shortest_path (как dijkstra_algorithm, но только для достигнутых узлов)
+    и количество раскрытий узлов.
+    '''
+    shortest_path = {start_node: 0}
+    previous_nodes = {}
+    expanded = 0
+    heap = [(heuristic(start_node, target_node), 0, start_node)]
+    while heap:
+        _, current_value, current_node = heapq.heappop(heap)
+        if current_value != shortest_path[current_node]:
+            continue  # Устаревшая запись: к узлу уже найден более короткий путь
+        expanded += 1
+        if current_node == target_node:
+            break
+
+        for neighbor, edge_value in graph.neighbors(current_node):
+            tentative_value = current_value + edge_value
+            if tentative_value < shortest_path.get(neighbor, sys.maxsize):
+                shortest_path[neighbor] = tentative_value
+                previous_nodes[neighbor] = current_node
+                estimate = tentative_value + heuristic(neighbor, target_node)
+                heapq.heappush(heap, (estimate, tentative_value, neighbor))
+
+    return previous_nodes, shortest_path, expanded
+
+
+def zero_heuristic(node, target_node):
+    "Нулевая эвристика - A* с ней работает как Дейкстра с остановкой на цели"
+    return 0
+
+
+def euclidean_heuristic(coordinates):
+    "Эвристика по прямому расстоянию на плоскости. coordinates - словарь {узел: (x, y)}"
+    def heuristic(node, target_node):
+        x1, y1 = coordinates[node]
+        x2, y2 = coordinates[target_node]
+        return math.hypot(x1 - x2, y1 - y2)
+    return heuristic
+
+
+def great_circle_heuristic(coordinates, radius=6371.0):
+    '''
+    Эвристика по расстоянию по большому кругу (формула гаверсинусов).
+    coordinates - словарь {узел: (широта, долгота)} в градусах, radius - радиус Земли в тех же единицах,
+    что и значения ребер (по умолчанию километры).
+    '''
+    def heuristic(node, target_node):
+        latitude1, longitude1 = map(math.radians, coordinates[node])
+        latitude2, longitude2 = map(math.radians, coordinates[target_node])
+        a = (math.sin((latitude2 - latitude1) / 2) ** 2
+             + math.cos(latitude1) * math.cos(latitude2) * math.sin((longitude2 - longitude1) / 2) ** 2)
+        return 2 * radius * math.asin(math.sqrt(a))
+    return heuristic
+
+
+def repair_shortest_paths(graph, previous_nodes, shortest_path, changed_edges):
+    '''
+    Исправляет результат dijkstra_heap (previous_nodes, shortest_path) после изменения ребер графа
+    через update_edge/remove_edge, не пересчитывая пути с нуля. changed_edges - список пар узлов измененных ребер.
+    1. Если ребро дерева путей стало длиннее или удалено, все узлы поддерева под ним теряют свои расстояния.
+       Каждому такому узлу назначается лучшее расстояние через соседей вне поддерева.
+    2. Концы измененных ребер и узлы поддеревьев кладутся в кучу, и дальше работает обычный Дейкстра,
+       который распространяет улучшения только туда, где расстояния действительно меняются.
+    Остальные расстояния остаются верными, поэтому работа пропорциональна размеру затронутой части графа.
+    Словари изменяются на месте и возвращаются.
+    '''
+    max_value = sys.maxsize
+    heap = []
+    invalid_roots = []
+    for node1, node2 in changed_edges:
+        for parent, child in ((node1, node2), (node2, node1)):
+            shortest_path.setdefault(child, max_value)
+            if previous_nodes.get(child) != parent:
+                continue
+            edge_value = graph.graph[parent].get(child)
+            if edge_value is None or shortest_path[parent] + edge_value > shortest_path[child]:
+                invalid_roots.append(child)
+        for node in (node1, node2):
+            if shortest_path[node] != max_value:
+                heapq.heappush(heap, (shortest_path[node], node))
+
+    if invalid_roots:
+        children = {}
+        for node, parent in previous_nodes.items():
+            children.setdefault(parent, []).append(node)
+        affected = set()
+        stack = list(invalid_roots)
+        while stack:
+            node = stack.pop()
+            if node in affected:
+                continue
+            affected.add(node)
+            stack.extend(children.get(node, []))
+
+        for node in affected:
+            shortest_path[node] = max_value
+            previous_nodes.pop(node, None)
+        for node in affected:
+            for neighbor, edge_value in graph.neighbors(node):
+                if neighbor not in affected and shortest_path.get(neighbor, max_value) != max_value:
+                    tentative_value = shortest_path[neighbor] + edge_value
+                    if tentative_value < shortest_path[node]:
+                        shortest_path[node] = tentative_value
+                        previous_nodes[node] = neighbor
+            if shortest_path[node] != max_value:
+                heapq.heappush(heap, (shortest_path[node], node))
+
+    while heap:
+        current_value, current_node = heapq.heappop(heap)
+        # Устаревшая запись: расстояние с тех пор уменьшилось или узел попал в поддерево с потерянными путями
+        if current_value != shortest_path[current_node]:
+            continue
+        for neighbor, edge_value in graph.neighbors(current_node):
+            tentative_value = current_value + edge_value
+            if tentative_value < shortest_path.get(neighbor, max_value):
+                shortest_path[neighbor] = tentative_value
+                previous_nodes[neighbor] = current_node
+                heapq.heappush(heap, (tentative_value, neighbor))
+
+    return previous_nodes, shortest_path
+
+
+def random_graph(nodes_count, edges_per_node, max_value=100, seed=None):
+    "Строит случайный связный граф для замеров: цепочка через все узлы плюс случайные ребра"
+    # Модуль random нужен только здесь, импорт внутри функции не замедляет импорт djkstra
+    import random
+
+    rnd = random.Random(seed)
+    nodes = [f"N{i}" for i in range(nodes_count)]
+    init_graph = {node: {} for node in nodes}
+    for i in range(1, nodes_count):
+        init_graph[nodes[i - 1]][nodes[i]] = rnd.randint(1, max_value)
+    for node in nodes:
+        for _ in range(edges_per_node - 1):
+            other = nodes[rnd.randrange(nodes_count)]
+            # Обратное ребро construct_graph добавит сам, поэтому второе значение для пары не задаем
+            if other != node and node not in init_graph[other]:
+                init_graph[node][other] = rnd.randint(1, max_value)
+    return Graph(nodes, init_graph)
+
+
 def print_result(previous_nodes, shortest_path, start_node, target_node):
     path = []
     node = target_node
@@ -104,24 +402,140 @@ def print_result(previous_nodes, shortest_path, start_node, target_node):
     print(" -> ".join(reversed(path)))
 
 
-nodes = ["Reykjavik", "Oslo", "Moscow", "London", "Rome", "Berlin", "Belgrade", "Athens"]
-
-init_graph = {}
-for node in nodes:
-    init_graph[node] = {}
-
-init_graph["Reykjavik"]["Oslo"] = 5
-init_graph["Reykjavik"]["London"] = 4
-init_graph["Oslo"]["Berlin"] = 1
-init_graph["Oslo"]["Moscow"] = 3
-init_graph["Moscow"]["Belgrade"] = 5
-init_graph["Moscow"]["Athens"] = 4
-init_graph["Athens"]["Belgrade"] = 1
-init_graph["Rome"]["Berlin"] = 2
-init_graph["Rome"]["Athens"] = 2
-
-graph = Graph(nodes, init_graph)
-
-previous_nodes, shortest_path = dijkstra_algorithm(graph=graph, start_node="Reykjavik")
-
-print_result(previous_nodes, shortest_path, start_node="Reykjavik", target_node="Belgrade")
\ No newline at end of file
+# Пример использования
+if __name__ == "__main__":
+    import random
+    import time
+
+    nodes = ["Reykjavik", "Oslo", "Moscow", "London", "Rome", "Berlin", "Belgrade", "Athens"]
+
+    init_graph = {}
+    for node in nodes:
+        init_graph[node] = {}
+
+    init_graph["Reykjavik"]["Oslo"] = 5
+    init_graph["Reykjavik"]["London"] = 4
+    init_graph["Oslo"]["Berlin"] = 1
+    init_graph["Oslo"]["Moscow"] = 3
+    init_graph["Moscow"]["Belgrade"] = 5
+    init_graph["Moscow"]["Athens"] = 4
+    init_graph["Athens"]["Belgrade"] = 1
+    init_graph["Rome"]["Berlin"] = 2
+    init_graph["Rome"]["Athens"] = 2
+
+    graph = Graph(nodes, init_graph)
+
+    previous_nodes, path_values = dijkstra_algorithm(graph=graph, start_node="Reykjavik")
+
+    print_result(previous_nodes, path_values, start_node="Reykjavik", target_node="Belgrade")
+
+    print("Маршрут Reykjavik -> Belgrade:", shortest_path(graph, "Reykjavik", "Belgrade"))
+    print("Двунаправленный поиск:", bidirectional_shortest_path(graph, "Reykjavik", "Belgrade"))
+
+    # Сравнение скорости простой реализации и реализации на куче
+    big_graph = random_graph(2000, 3, seed=1)
+
+    start_time = time.time()
+    slow_result = dijkstra_algorithm(big_graph, "N0")
+    elapsed_time = time.time() - start_time
+    print(f'Линейный поиск минимума. Узлов: 2000. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    fast_result = dijkstra_heap(big_graph, "N0")
+    elapsed_time = time.time() - start_time
+    print(f'Двоичная куча. Узлов: 2000. Время в мс:{elapsed_time * 1000:.4f}')
+    print("Расстояния совпадают:", slow_result[1] == fast_result[1])
+
+    # Сравнение полного обхода и поиска пути между двумя узлами
+    big_graph = random_graph(20000, 3, seed=2)
+    rnd = random.Random(2)
+    pairs = [(f"N{rnd.randrange(20000)}", f"N{rnd.randrange(20000)}") for _ in range(10)]
+
+    start_time = time.time()
+    full_values = [dijkstra_heap(big_graph, source)[1][target] for source, target in pairs]
+    elapsed_time = time.time() - start_time
+    print(f'Полный обход от источника. Запросов: {len(pairs)}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    pair_values = [shortest_path(big_graph, source, target)[0] for source, target in pairs]
+    elapsed_time = time.time() - start_time
+    print(f'Остановка на цели. Запросов: {len(pairs)}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    bidirectional_values = [bidirectional_shortest_path(big_graph, source, target)[0] for source, target in pairs]
+    elapsed_time = time.time() - start_time
+    print(f'Двунаправленный поиск. Запросов: {len(pairs)}. Время в мс:{elapsed_time * 1000:.4f}')
+    print("Расстояния совпадают:", full_values == pair_values == bidirectional_values)
+
+    # A* на карте городов: значения ребер - расстояния по большому кругу в километрах
+    coordinates = {
+        "Reykjavik": (64.15, -21.94), "Oslo": (59.91, 10.75), "Moscow": (55.76, 37.62), "London": (51.51, -0.13),
+        "Rome": (41.90, 12.50), "Berlin": (52.52, 13.40), "Belgrade": (44.79, 20.45), "Athens": (37.98, 23.73),
+    }
+    great_circle = great_circle_heuristic(coordinates)
+    geo_graph = {node: {} for node in nodes}
+    for node, edges in init_graph.items():
+        for adjacent_node in edges:
+            geo_graph[node][adjacent_node] = math.ceil(great_circle(node, adjacent_node))
+    geo_graph = Graph(nodes, geo_graph)
+    previous_nodes, path_values, expanded = a_star(geo_graph, "Reykjavik", "Belgrade", great_circle)
+    print_result(previous_nodes, path_values, start_node="Reykjavik", target_node="Belgrade")
+    print(f'A*: раскрыто узлов {expanded}, '
+          f'Дейкстра: {a_star(geo_graph, "Reykjavik", "Belgrade", zero_heuristic)[2]}')
+
+    # A* на сетке: узлы - точки плоскости, значения ребер - расстояния между ними
+    side = 150
+    grid_nodes = [(x, y) for x in range(side) for y in range(side)]
+    grid_coordinates = {node: node for node in grid_nodes}
+    rnd = random.Random(3)
+    grid = {node: {} for node in grid_nodes}
+    for x, y in grid_nodes:
+        for dx, dy in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            neighbor = (x + dx, y + dy)
+            if neighbor in grid:
+                # Дорога не короче прямой, поэтому евклидова эвристика допустима
+                grid[(x, y)][neighbor] = math.hypot(dx, dy) * rnd.uniform(1.0, 1.2)
+    grid = Graph(grid_nodes, grid)
+    euclidean = euclidean_heuristic(grid_coordinates)
+    source, target = (10, 20), (side - 10, side - 30)
+
+    start_time = time.time()
+    _, dijkstra_values, dijkstra_expanded = a_star(grid, source, target, zero_heuristic)
+    elapsed_time = time.time() - start_time
+    print(f'Дейкстра. Раскрыто узлов: {dijkstra_expanded}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    _, a_star_values, a_star_expanded = a_star(grid, source, target, euclidean)
+    elapsed_time = time.time() - start_time
+    print(f'A*. Раскрыто узлов: {a_star_expanded}. Время в мс:{elapsed_time * 1000:.4f}')
+    print("Расстояния совпадают:", math.isclose(dijkstra_values[target], a_star_values[target]))
+
+    # Исправление дерева путей после изменения нескольких ребер и полный пересчет
+    big_graph = random_graph(20000, 3, seed=7)
+    previous_nodes, path_values = dijkstra_heap(big_graph, "N0")
+    rnd = random.Random(7)
+    repair_time = full_time = 0
+    repaired_correctly = True
+    for _ in range(10):
+        changed_edges = []
+        for _ in range(5):
+            node = f"N{rnd.randrange(20000)}"
+            neighbor = rnd.choice(list(big_graph.graph[node]))
+            action = rnd.random()
+            if action < 0.2 and len(big_graph.graph[node]) > 1 and len(big_graph.graph[neighbor]) > 1:
+                big_graph.remove_edge(node, neighbor)
+            else:
+                big_graph.update_edge(node, neighbor, max(1, big_graph.value(node, neighbor) + rnd.randint(-50, 50)))
+            changed_edges.append((node, neighbor))
+
+        start_time = time.time()
+        repair_shortest_paths(big_graph, previous_nodes, path_values, changed_edges)
+        repair_time += time.time() - start_time
+
+        start_time = time.time()
+        expected_values = dijkstra_heap(big_graph, "N0")[1]
+        full_time += time.time() - start_time
+        repaired_correctly = repaired_correctly and expected_values == path_values
+    print(f'Полный пересчет. Изменений: 10 по 5 ребер. Время в мс:{full_time * 1000:.4f}')
+    print(f'Исправление дерева. Изменений: 10 по 5 ребер. Время в мс:{repair_time * 1000:.4f}')
+    print("Расстояния совпадают:", repaired_correctly)
@@ -0,0 +1,122 @@
+# Матрица расстояний между многими источниками и всеми узлами графа.
+# Запуски Дейкстры от разных источников независимы, поэтому их можно раздать пулу процессов.
+# Граф один раз упаковывается в целочисленные массивы (CSR, как в csr_graph.py) и передается процессам
+# при их запуске: при старте через fork процессы получают его из памяти родителя без копирования и pickle,
+# иначе граф передается каждому процессу один раз через initializer, а не с каждой задачей.
+# Каждая задача обрабатывает пачку источников и возвращает строки матриц в виде байтов массивов.
+
+import heapq
+import math
+from array import array
+
+# Граф, с которым работает процесс пула: (offsets, targets, weights)
+_worker_graph = None
+
+
+def pack_graph(graph):
+    "Упаковывает граф с интерфейсом Graph (get_nodes, neighbors) в метки и массивы offsets/targets/weights"
+    labels = list(graph.get_nodes())
+    index = {label: i for i, label in enumerate(labels)}
+    offsets = array('q', [0])
+    targets = array('q')
+    weights = array('d')
+    for label in labels:
+        for neighbor, value in graph.neighbors(label):
+            targets.append(index[neighbor])
+            weights.append(value)
+        offsets.append(len(targets))
+    return labels, (offsets, targets, weights)
+
+
+def _init_worker(packed_graph):
+    global _worker_graph
+    _worker_graph = packed_graph
+
+
+def _dijkstra_rows(sources):
+    "Дейкстра на куче от каждого источника пачки; возвращает байты строк расстояний и предыдущих узлов"
+    offsets, targets, weights = _worker_graph
+    nodes_count = len(offsets) - 1
+    result = []
+    for source in sources:
+        distances = array('d', [math.inf]) * nodes_count
+        previous_nodes = array('q', [-1]) * nodes_count
+        distances[source] = 0
+        heap = [(0, source)]
+        while heap:
+            current_value, current_node = heapq.heappop(heap)
+            if current_value > distances[current_node]:
+                continue
+            for position in range(offsets[current_node], offsets[current_node + 1]):
+                neighbor = targets[position]
+                tentative_value = current_value + weights[position]
+                if tentative_value < distances[neighbor]:
+                    distances[neighbor] = tentative_value
+                    previous_nodes[neighbor] = current_node
+                    heapq.heappush(heap, (tentative_value, neighbor))
+        result.append((distances.tobytes(), previous_nodes.tobytes()))
+    return result
+
+
+def multi_source_dijkstra(graph, sources, workers=None, chunk_size=16):
+    '''
+    Кратчайшие расстояния от каждого узла из sources до всех узлов графа.
+    Возвращает (labels, distances, previous_nodes): labels - узлы в порядке столбцов,
+    distances[i][j] - расстояние от sources[i] до labels[j] (math.inf, если узел недостижим),
+    previous_nodes[i][j] - номер предыдущего узла на кратчайшем пути (-1 для источника и недостижимых узлов).
+    Строки матриц - массивы array('d') и array('q') одинаковой длины, numpy.array(distances) дает плотную матрицу.
+    '''
+    # multiprocessing и concurrent.futures импортируются долго, поэтому только при запуске пула
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _worker_graph
+    labels, packed_graph = pack_graph(graph)
+    index = {label: i for i, label in enumerate(labels)}
+    source_ids = [index[source] for source in sources]
+    chunks = [source_ids[i:i + chunk_size] for i in range(0, len(source_ids), chunk_size)]
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Процессы наследуют граф из памяти родителя
+        _worker_graph = packed_graph
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+    else:
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(packed_graph,))
+
+    distances = []
+    previous_nodes = []
+    with executor:
+        for rows in executor.map(_dijkstra_rows, chunks):
+            for distances_bytes, previous_bytes in rows:
+                distances.append(array('d', distances_bytes))
+                previous_nodes.append(array('q', previous_bytes))
+    _worker_graph = None
+    return labels, distances, previous_nodes
+
+
+# Пример использования
+if __name__ == "__main__":
+    import os
+    import random
+    import time
+
+    from .djkstra import dijkstra_heap, random_graph
+
+    print()
+    print("Матрица расстояний")
+    graph = random_graph(5000, 3, seed=5)
+    sources = random.Random(5).sample(graph.get_nodes(), 32)
+
+    start_time = time.time()
+    expected = [dijkstra_heap(graph, source)[1] for source in sources]
+    elapsed_time = time.time() - start_time
+    print(f'Последовательный цикл. Источников: {len(sources)}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        start_time = time.time()
+        labels, distances, previous_nodes = multi_source_dijkstra(graph, sources, workers=workers)
+        elapsed_time = time.time() - start_time
+        print(f'Пул процессов: {workers}. Источников: {len(sources)}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    print("Расстояния совпадают:",
+          all(list(row) == [values[label] for label in labels] for row, values in zip(distances, expected)))
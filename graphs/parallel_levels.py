@@ -0,0 +1,231 @@
+# Параллельный поиск в ширину по уровням (level-synchronous BFS).
+# BFS обходит граф уровнями: все вершины на расстоянии k, затем все на расстоянии k + 1.
+# Вершины одного уровня можно обрабатывать независимо, поэтому уровень делится на части между процессами пула.
+# Граф хранится в разделяемой памяти (shared_memory) в формате CSR (см. csr_graph.py): массивы offsets и targets
+# целых чисел. Там же лежат карта посещенных вершин и номера уровней, так что процессы читают и пишут их
+# без копирования. Карта посещений хранит байт на вершину: запись отдельных битов одного байта из разных
+# процессов могла бы затирать соседние биты.
+#
+# Обход с переключением направления (direction-optimizing BFS):
+#   сверху вниз (top-down)   - для каждой вершины уровня просматриваются ее соседи; выгодно, пока уровень мал;
+#   снизу вверх (bottom-up)  - для каждой непосещенной вершины ищется сосед из текущего уровня, поиск по вершине
+#                              прекращается на первом найденном соседе; выгодно, когда уровень охватывает
+#                              большую часть графа и почти каждое ребро ведет в уже посещенную вершину.
+# Обход снизу вверх требует неориентированного графа: соседи вершины должны совпадать с входящими ребрами.
+
+from array import array
+
+# Разделяемые массивы процесса пула: offsets, targets, visited, in_frontier
+_worker_arrays = None
+
+
+class SharedCSR:
+    """Граф CSR в разделяемой памяти: offsets, targets и рабочие массивы обхода visited, in_frontier, levels"""
+
+    def __init__(self, labels, offsets, targets):
+        self.labels = labels  # Номер вершины -> метка
+        self.index = {label: i for i, label in enumerate(labels)}  # Метка -> номер вершины
+        self.nodes_count = len(offsets) - 1
+        self.edges_count = len(targets)
+        self.blocks = []
+        self.offsets = self._share(offsets)
+        self.targets = self._share(targets)
+        self.visited = self._share(bytes(self.nodes_count))
+        self.in_frontier = self._share(bytes(self.nodes_count))
+        self.levels = self._share(array('q', [-1]) * self.nodes_count)
+
+    @classmethod
+    def from_adjacency(cls, graph):
+        "Строит граф из словаря списков {вершина: [соседи]}, как в DFC_and_BFS.py"
+        labels = list(graph)
+        index = {label: i for i, label in enumerate(labels)}
+        offsets = array('q', [0])
+        targets = array('q')
+        for vertex in labels:
+            targets.extend(index[neighbor] for neighbor in graph[vertex])
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets)
+
+    def _share(self, data):
+        "Копирует массив или байты в новый блок разделяемой памяти и возвращает memoryview на него"
+        # multiprocessing импортируется долго, поэтому только когда он действительно нужен
+        from multiprocessing import shared_memory
+
+        data = memoryview(data)
+        block = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        self.blocks.append(block)
+        view = block.buf[:data.nbytes]
+        if data.format != 'B':
+            view = view.cast(data.format)
+        view[:] = data
+        return view
+
+    def close(self):
+        "Освобождает разделяемую память"
+        for view in (self.offsets, self.targets, self.visited, self.in_frontier, self.levels):
+            view.release()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def _init_worker(names, formats):
+    "Подключает процесс к блокам разделяемой памяти по именам (для запуска процессов без fork)"
+    from multiprocessing import shared_memory
+
+    global _worker_arrays
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _worker_arrays = (blocks,) + tuple(block.buf.cast(format) if format != 'B' else block.buf
+                                      for block, format in zip(blocks, formats))
+
+
+def _top_down(frontier_bytes):
+    "Просматривает соседей части уровня и возвращает байты массива впервые найденных вершин"
+    _, offsets, targets, visited, _ = _worker_arrays
+    next_frontier = array('q')
+    for vertex in array('q', frontier_bytes):
+        for position in range(offsets[vertex], offsets[vertex + 1]):
+            neighbor = targets[position]
+            if not visited[neighbor]:
+                # Два процесса могут одновременно найти одну вершину - дубликаты убирает главный процесс
+                visited[neighbor] = 1
+                next_frontier.append(neighbor)
+    return next_frontier.tobytes()
+
+
+def _bottom_up(vertex_range):
+    "Для непосещенных вершин диапазона ищет соседа из текущего уровня и возвращает байты найденных вершин"
+    _, offsets, targets, visited, in_frontier = _worker_arrays
+    next_frontier = array('q')
+    for vertex in range(*vertex_range):
+        if visited[vertex]:
+            continue
+        for position in range(offsets[vertex], offsets[vertex + 1]):
+            if in_frontier[targets[position]]:
+                next_frontier.append(vertex)
+                break
+    return next_frontier.tobytes()
+
+
+def parallel_bfs(shared_graph, start, workers=None, direction='auto', alpha=14, beta=24, chunk_size=4096):
+    '''
+    Поиск в ширину от метки start, уровни обрабатываются пулом из workers процессов.
+    direction: 'top-down', 'bottom-up' или 'auto' - переключение по правилу Бимера: снизу вверх, когда число ребер
+    из уровня больше числа ребер из непосещенных вершин, деленного на alpha; обратно сверху вниз, когда уровень
+    меньше nodes_count / beta вершин.
+    Возвращает memoryview shared_graph.levels: номер уровня каждой вершины или -1, если вершина недостижима.
+    '''
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _worker_arrays
+    graph = shared_graph
+    offsets, visited, in_frontier, levels = graph.offsets, graph.visited, graph.in_frontier, graph.levels
+    visited[:] = bytes(graph.nodes_count)
+    in_frontier[:] = bytes(graph.nodes_count)
+    levels[:] = array('q', [-1]) * graph.nodes_count
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Процессы наследуют отображение разделяемой памяти от родителя
+        _worker_arrays = (None, offsets, graph.targets, visited, in_frontier)
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+    else:
+        names = [block.name for block in graph.blocks[:4]]
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(names, ['q', 'q', 'B', 'B']))
+
+    source = graph.index[start]
+    frontier = array('q', [source])
+    visited[source] = 1
+    levels[source] = 0
+    unexplored_edges = graph.edges_count - (offsets[source + 1] - offsets[source])
+    bottom_up = direction == 'bottom-up'
+    level = 0
+    with executor:
+        while frontier:
+            if direction == 'auto':
+                frontier_edges = sum(offsets[vertex + 1] - offsets[vertex] for vertex in frontier)
+                if not bottom_up and frontier_edges > unexplored_edges / alpha:
+                    bottom_up = True
+                elif bottom_up and len(frontier) < graph.nodes_count / beta:
+                    bottom_up = False
+
+            if bottom_up:
+                for vertex in frontier:
+                    in_frontier[vertex] = 1
+                ranges = [(first, min(first + chunk_size, graph.nodes_count))
+                          for first in range(0, graph.nodes_count, chunk_size)]
+                results = executor.map(_bottom_up, ranges)
+            else:
+                chunks = [frontier[first:first + chunk_size].tobytes() for first in range(0, len(frontier), chunk_size)]
+                results = executor.map(_top_down, chunks)
+
+            level += 1
+            next_frontier = array('q')
+            for result in results:
+                for vertex in array('q', result):
+                    if levels[vertex] == -1:
+                        levels[vertex] = level
+                        next_frontier.append(vertex)
+            if bottom_up:
+                for vertex in frontier:
+                    in_frontier[vertex] = 0
+                for vertex in next_frontier:
+                    visited[vertex] = 1
+            unexplored_edges -= sum(offsets[vertex + 1] - offsets[vertex] for vertex in next_frontier)
+            frontier = next_frontier
+    _worker_arrays = None
+    return levels
+
+
+def sequential_levels(shared_graph, start):
+    "Обычный BFS в одном процессе по тем же массивам CSR, для сравнения; возвращает список уровней"
+    offsets, targets = shared_graph.offsets, shared_graph.targets
+    levels = [-1] * shared_graph.nodes_count
+    source = shared_graph.index[start]
+    levels[source] = 0
+    frontier = [source]
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for vertex in frontier:
+            for position in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = targets[position]
+                if levels[neighbor] == -1:
+                    levels[neighbor] = level
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return levels
+
+
+# Пример использования
+if __name__ == "__main__":
+    import os
+    import random
+    import time
+
+    print("Параллельный BFS")
+    rnd = random.Random(10)
+    count = 200000
+    graph = {vertex: [] for vertex in range(count)}
+    for _ in range(count * 4):
+        u, v = rnd.randrange(count), rnd.randrange(count)
+        graph[u].append(v)
+        graph[v].append(u)
+    shared_graph = SharedCSR.from_adjacency(graph)
+    print(f'Вершин: {count}. Ребер (в обе стороны): {shared_graph.edges_count}')
+
+    start_time = time.time()
+    expected = sequential_levels(shared_graph, 0)
+    elapsed_time = time.time() - start_time
+    print(f'Один процесс без пула. Время в мс:{elapsed_time * 1000:.4f}')
+
+    for direction in ('top-down', 'auto'):
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            start_time = time.time()
+            levels = parallel_bfs(shared_graph, 0, workers=workers, direction=direction)
+            elapsed_time = time.time() - start_time
+            print(f'{direction}. Процессов: {workers}. Время в мс:{elapsed_time * 1000:.4f}. '
+                  f'Уровни совпадают: {list(levels) == expected}')
+    shared_graph.close()
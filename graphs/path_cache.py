@@ -0,0 +1,126 @@
+# Кэш деревьев кратчайших путей.
+# Одни и те же запросы (start_node, target_node) приходят снова и снова, а dijkstra_heap от одного источника
+# сразу дает пути до всех узлов. Поэтому кэшируется все дерево (previous_nodes, shortest_path) для источника,
+# и любой следующий запрос из того же источника отвечается без поиска.
+# Память ограничена: при переполнении удаляется дерево, которое дольше всех не запрашивалось (LRU).
+# Граф меняется через Graph.update_edge, который увеличивает graph.version; при несовпадении версии кэш очищается.
+
+import sys
+from collections import OrderedDict
+
+from .djkstra import dijkstra_heap
+
+
+class ShortestPathCache:
+    """LRU-кэш деревьев кратчайших путей по источнику"""
+
+    def __init__(self, graph, max_entries=128, max_bytes=None, algorithm=dijkstra_heap):
+        self.graph = graph
+        self.max_entries = max_entries  # Наибольшее число деревьев, None - без ограничения
+        self.max_bytes = max_bytes  # Наибольший примерный размер деревьев в байтах, None - без ограничения
+        self.algorithm = algorithm
+        self.trees = OrderedDict()  # Источник -> (previous_nodes, shortest_path, размер в байтах)
+        self.size_bytes = 0
+        self.version = getattr(graph, "version", 0)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_tree(self, start_node):
+        "Возвращает (previous_nodes, shortest_path) для источника, при промахе запускает алгоритм"
+        self._check_version()
+        if start_node in self.trees:
+            self.hits += 1
+            self.trees.move_to_end(start_node)
+            previous_nodes, shortest_path, _ = self.trees[start_node]
+            return previous_nodes, shortest_path
+
+        self.misses += 1
+        previous_nodes, shortest_path = self.algorithm(self.graph, start_node)
+        size = sys.getsizeof(previous_nodes) + sys.getsizeof(shortest_path)
+        self.trees[start_node] = (previous_nodes, shortest_path, size)
+        self.size_bytes += size
+        self._evict()
+        return previous_nodes, shortest_path
+
+    def shortest_path(self, start_node, target_node):
+        "Пара (значение пути, список узлов пути); если пути нет - (sys.maxsize, [])"
+        previous_nodes, shortest_path = self.get_tree(start_node)
+        if shortest_path.get(target_node, sys.maxsize) == sys.maxsize:
+            return sys.maxsize, []
+        path = [target_node]
+        while path[-1] != start_node:
+            path.append(previous_nodes[path[-1]])
+        path.reverse()
+        return shortest_path[target_node], path
+
+    def clear(self):
+        "Удаляет все деревья из кэша"
+        self.trees.clear()
+        self.size_bytes = 0
+
+    def stats(self):
+        "Счетчики попаданий, промахов, вытеснений и сбросов кэша"
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self.trees),
+            "bytes": self.size_bytes,
+        }
+
+    def _check_version(self):
+        "Очищает кэш, если граф изменился после заполнения"
+        version = getattr(self.graph, "version", 0)
+        if version != self.version:
+            self.version = version
+            if self.trees:
+                self.invalidations += 1
+            self.clear()
+
+    def _evict(self):
+        "Удаляет самые давно использованные деревья, пока кэш не уложится в ограничения"
+        while self.trees and (
+                (self.max_entries is not None and len(self.trees) > self.max_entries)
+                or (self.max_bytes is not None and self.size_bytes > self.max_bytes)):
+            _, (_, _, size) = self.trees.popitem(last=False)
+            self.size_bytes -= size
+            self.evictions += 1
+
+
+# Пример использования
+if __name__ == "__main__":
+    import random
+    import time
+
+    from .djkstra import random_graph
+
+    print()
+    print("Кэш кратчайших путей")
+    graph = random_graph(2000, 3, seed=6)
+    cache = ShortestPathCache(graph, max_entries=20)
+    rnd = random.Random(6)
+    # Запросы приходят от небольшого числа популярных источников
+    popular = [f"N{rnd.randrange(2000)}" for _ in range(30)]
+    queries = [(rnd.choice(popular), f"N{rnd.randrange(2000)}") for _ in range(200)]
+
+    start_time = time.time()
+    for source, target in queries:
+        dijkstra_heap(graph, source)
+    elapsed_time = time.time() - start_time
+    print(f'Без кэша. Запросов: {len(queries)}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    for source, target in queries:
+        cache.shortest_path(source, target)
+    elapsed_time = time.time() - start_time
+    print(f'С кэшем. Запросов: {len(queries)}. Время в мс:{elapsed_time * 1000:.4f}')
+    print(cache.stats())
+
+    source, target = queries[0]
+    value, path = cache.shortest_path(source, target)
+    graph.update_edge(path[0], path[1], graph.value(path[0], path[1]) + 1000)
+    print("После изменения ребра:", cache.shortest_path(source, target)[0] == dijkstra_heap(graph, source)[1][target])
+    print(cache.stats())
@@ -0,0 +1,303 @@
+# Общий алгоритм поиска в пространстве состояний с заменяемой стратегией переднего края (frontier).
+# Класс BFS из BFS_1.py всегда берет узлы из очереди (FIFO). Если заменить очередь на другую структуру,
+# тот же цикл "взять узел - проверить - нарастить" дает другие алгоритмы:
+#   очередь (FIFO)            - поиск в ширину, находит путь с наименьшим числом шагов;
+#   стек (LIFO)               - поиск в глубину, передний край растет только вдоль одной ветви;
+#   очередь с приоритетом     - поиск по стоимости (по глубине) или "жадный" поиск по эвристике (best-first).
+# Поиск с итеративным углублением (IDDFS) повторяет поиск в глубину с ограничением глубины 0, 1, 2, ...
+# Он находит кратчайший путь, как BFS, но хранит только текущий путь, поэтому память растет линейно от глубины.
+# Все стратегии работают с любыми задачами, реализующими интерфейс Node (extend_node, is_the_solution).
+
+import heapq
+import itertools
+from collections import deque
+
+
+class FIFOFrontier:
+    """
+      Frontier as a queue, the search expands the oldest node first (Breadth First Search)
+
+      Methods
+      -------
+      push(self, node, depth)
+          Insert a node with its depth to the end of the queue
+      pop(self)
+          Remove and return the pair (node, depth) from the beginning of the queue
+    """
+
+    def __init__(self):
+        self.items = deque()
+
+    def push(self, node, depth):
+        self.items.append((node, depth))
+
+    def pop(self):
+        return self.items.popleft()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class LIFOFrontier:
+    """
+      Frontier as a stack, the search expands the newest node first (Depth First Search)
+
+      Methods
+      -------
+      push(self, node, depth)
+          Insert a node with its depth to the top of the stack
+      pop(self)
+          Remove and return the pair (node, depth) from the top of the stack
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def push(self, node, depth):
+        self.items.append((node, depth))
+
+    def pop(self):
+        return self.items.pop()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class PriorityFrontier:
+    """
+      Frontier as a priority queue, the search expands the node with the smallest key first
+
+      Attributes
+      ----------
+      key : Function
+          key(node, depth) returns the priority of the node, for example the depth (uniform cost search)
+          or the heuristic estimate of the distance to the solution (greedy best-first search)
+
+      Methods
+      -------
+      push(self, node, depth)
+          Insert a node with its depth to the heap
+      pop(self)
+          Remove and return the pair (node, depth) with the smallest key
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.items = []
+        # Счетчик разрешает равенство приоритетов в порядке добавления и избавляет от сравнения узлов
+        self.counter = itertools.count()
+
+    def push(self, node, depth):
+        heapq.heappush(self.items, (self.key(node, depth), next(self.counter), node, depth))
+
+    def pop(self):
+        _, _, node, depth = heapq.heappop(self.items)
+        return node, depth
+
+    def __len__(self):
+        return len(self.items)
+
+
+class Search:
+    """
+      This class used to represent the generic graph search with a pluggable frontier
+
+      ...
+
+      Attributes
+      ----------
+      start_state : Node
+          represent the initial state of the problem
+      final_state : Node
+          represent the final state (target) of the problem
+      frontier : FIFOFrontier, LIFOFrontier or PriorityFrontier
+          defines the order in which nodes are expanded
+      reached_nodes : Set
+          represents the set of nodes that have been inserted to the frontier
+      number_of_expansions : Integer
+          number of nodes that have been extended
+      max_frontier_size : Integer
+          the largest size of the frontier throughout the algorithm execution
+
+      Methods
+      -------
+      search(self)
+          Search for a solution, returns the solution node or None
+    """
+
+    def __init__(self, start, final, frontier):
+        self.start_state = start
+        self.final_state = final
+        self.frontier = frontier
+        self.frontier.push(start, 0)
+        self.reached_nodes = {start}
+        self.number_of_expansions = 0
+        self.max_frontier_size = 1
+
+    def search(self):
+        """
+          Take nodes from the frontier until the solution is found or the frontier is empty
+
+          Returns
+          -------
+          Node
+            the solution node or None if no solution found
+        """
+        while len(self.frontier) > 0:
+            selected_node, depth = self.frontier.pop()
+            if selected_node.is_the_solution(self.final_state):
+                return selected_node
+
+            self.number_of_expansions += 1
+            for new_node in selected_node.extend_node():
+                if new_node not in self.reached_nodes:
+                    self.reached_nodes.add(new_node)
+                    self.frontier.push(new_node, depth + 1)
+            self.max_frontier_size = max(self.max_frontier_size, len(self.frontier))
+        return None
+
+
+class IterativeDeepeningSearch:
+    """
+      This class used to represent the Iterative Deepening Depth First Search (IDDFS)
+
+      ...
+
+      Attributes
+      ----------
+      start_state : Node
+          represent the initial state of the problem
+      final_state : Node
+          represent the final state (target) of the problem
+      max_depth : Integer
+          the largest depth limit to try
+      number_of_expansions : Integer
+          number of nodes that have been extended in all iterations
+      max_frontier_size : Integer
+          the largest size of the stack throughout the algorithm execution
+
+      Methods
+      -------
+      search(self)
+          Repeat the depth limited search with limits 0, 1, 2, ... max_depth
+      depth_limited_search(self, limit)
+          Depth First Search that does not extend nodes deeper than limit
+    """
+
+    def __init__(self, start, final, max_depth=10 ** 6):
+        self.start_state = start
+        self.final_state = final
+        self.max_depth = max_depth
+        self.number_of_expansions = 0
+        self.max_frontier_size = 1
+
+    def search(self):
+        """
+          Repeat the depth limited search increasing the limit until the solution is found
+
+          Returns
+          -------
+          Node
+            the solution node or None if no solution found
+        """
+        for limit in range(self.max_depth + 1):
+            solution, cutoff = self.depth_limited_search(limit)
+            if solution is not None or not cutoff:
+                return solution
+        return None
+
+    def depth_limited_search(self, limit):
+        """
+          Depth First Search that keeps only the current path: a stack of children iterators.
+          States on the current path are not extended again, so the search does not loop.
+
+          Returns
+          -------
+          Tuple
+            the solution node or None, and True if some nodes were not extended because of the limit
+        """
+        if self.start_state.is_the_solution(self.final_state):
+            return self.start_state, False
+        if limit == 0:
+            return None, True
+        cutoff = False
+        path = [self.start_state]
+        path_states = {self.start_state}
+        stack = [iter(self.start_state.extend_node())]
+        self.number_of_expansions += 1
+        while stack:
+            new_node = next(stack[-1], None)
+            if new_node is None:
+                stack.pop()
+                path_states.discard(path.pop())
+                continue
+            if new_node in path_states:
+                continue
+            if new_node.is_the_solution(self.final_state):
+                return new_node, False
+            if len(path) == limit:
+                cutoff = True
+                continue
+            self.number_of_expansions += 1
+            path.append(new_node)
+            path_states.add(new_node)
+            stack.append(iter(new_node.extend_node()))
+            self.max_frontier_size = max(self.max_frontier_size, len(stack))
+        return None, cutoff
+
+
+def perfect_maze(side, seed=None):
+    "Лабиринт на сетке side x side без циклов: случайное остовное дерево, построенное поиском в глубину"
+    import random
+
+    rnd = random.Random(seed)
+    maze = {(x, y): [] for x in range(side) for y in range(side)}
+    stack = [(0, 0)]
+    visited = {(0, 0)}
+    while stack:
+        x, y = stack[-1]
+        candidates = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                      if (x + dx, y + dy) in maze and (x + dx, y + dy) not in visited]
+        if not candidates:
+            stack.pop()
+            continue
+        cell = rnd.choice(candidates)
+        maze[(x, y)].append(cell)
+        maze[cell].append((x, y))
+        visited.add(cell)
+        stack.append(cell)
+    return maze
+
+
+# Пример использования: сравнение стратегий на лабиринте
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    from .BFS_1 import MazeNode
+
+
+    print()
+    print("Стратегии поиска")
+    side = 20
+    maze = perfect_maze(side, seed=8)
+    target = (side - 1, side - 1)
+    strategies = {
+        "BFS (FIFO)": lambda start, final: Search(start, final, FIFOFrontier()),
+        "DFS (LIFO)": lambda start, final: Search(start, final, LIFOFrontier()),
+        "Поиск по стоимости": lambda start, final: Search(start, final, PriorityFrontier(lambda node, depth: depth)),
+        "Жадный поиск": lambda start, final: Search(start, final, PriorityFrontier(
+            lambda node, depth: abs(node.value[0] - target[0]) + abs(node.value[1] - target[1]))),
+        "IDDFS": lambda start, final: IterativeDeepeningSearch(start, final),
+    }
+    for name, make_search in strategies.items():
+        tracemalloc.start()
+        start_time = time.time()
+        search = make_search(MazeNode(maze, (0, 0)), MazeNode(maze, target))
+        solution = search.search()
+        elapsed_time = time.time() - start_time
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{name}. Раскрыто узлов: {search.number_of_expansions}. Длина пути: {len(solution._find_path()) - 1}. '
+              f'Наибольший передний край: {search.max_frontier_size}. Пик памяти, КБ: {peak_memory / 1024:.1f}. '
+              f'Время в мс:{elapsed_time * 1000:.4f}')
@@ -0,0 +1,3 @@
+# Пакет структур данных.
+# Модули, которые импортируют соседние модули пакета (binary_tree.py, binary_search_tree.py),
+# запускаются из корня репозитория командой python -m structures.<модуль>, например python -m structures.binary_tree.
@@ -3,10 +3,77 @@
 # У каждого узла не более двух детей.
 # Любое значение меньше значения узла становится левым ребенком или ребенком левого ребенка.
 # Любое значение больше или равное значению узла становится правым ребенком или ребенком правого ребенка.
+#
+# Если ключи приходят по возрастанию, обычное дерево вырождается в список: каждый новый узел становится правым
+# ребенком предыдущего, высота равна числу узлов, и поиск, вставка и удаление занимают O(n).
+# АВЛ-дерево (AVLTree) после каждой вставки и удаления восстанавливает баланс поворотами: высоты левого и правого
+# поддерева любого узла отличаются не больше чем на 1. Высота такого дерева не превышает 1.44 * log2(n),
+# поэтому все операции выполняются за O(log n) при любом порядке ключей.
+# Вставка, поиск и удаление написаны без рекурсии: путь от корня хранится в списке, и балансировка
+# идет по нему снизу вверх, поэтому глубина дерева не ограничена глубиной рекурсии Python.
+#
+# Упорядоченный словарь (OrderedMap) - АВЛ-дерево пар ключ-значение, в каждом узле которого хранится еще и
+# размер поддерева (число узлов). По размерам за O(log n) находятся k-й по порядку ключ (select) и число ключей
+# меньше заданного (rank). Ближайшие ключи снизу и сверху (floor, ceiling) и обход диапазона ключей
+# ленивым итератором тоже не требуют обхода всего дерева: итератор выдает ключи по одному, храня только стек
+# из O(log n) узлов.
+#
+# Дерево из n ключей можно построить без n вставок: из упорядоченных ключей (from_sorted) средний ключ
+# становится корнем, половины - поддеревьями, и получается идеально сбалансированное дерево за O(n).
+# Объединение двух деревьев (union) сливает их упорядоченные обходы, как в сортировке слиянием,
+# и строит из результата новое дерево тем же способом за O(n + m).
+#
+# Узлы объявлены с __slots__: у объекта нет словаря атрибутов, и узел с ключом-числом занимает около 84 байт
+# (56 байт узел и 28 байт число) вместо 124. Еще компактнее дерево в виде структуры массивов
+# (ArrayBinarySearchTree): ключи, номера левых и правых потомков лежат в трех массивах array,
+# узел - это номер позиции в них, а -1 означает "нет потомка".
+# Узел занимает 24 байта, объектов Python на каждый узел не создается вовсе.
+#
+# Дерево сохраняется в двоичный файл (save) как упорядоченный массив ключей: заголовок 16 байт - сигнатура b'BSTK',
+# тип ключей (typecode модуля array), 3 пустых байта и число ключей (int64), затем сами ключи.
+# Форма дерева не сохраняется - load отображает файл в память (mmap) и строит сбалансированное дерево
+# через from_sorted за O(n), без вставок и сравнений при спуске.
+
+import gc
+import heapq
+import mmap
+import struct
+from array import array
+
+from .tree_traversal import iter_inorder, iter_inorder_nodes, iter_morris_inorder, iter_postorder, iter_preorder
+
+MAGIC = b'BSTK'
+HEADER = struct.Struct('<4sc3xq')
+
+
+def _write_keys(path, keys):
+    """Записывает массив ключей array в двоичный файл"""
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, keys.typecode.encode(), len(keys)))
+        keys.tofile(file)
+
+
+def _read_keys(path):
+    """Читает массив ключей из двоичного файла через отображение в память"""
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        if len(mapping) < HEADER.size:
+            raise ValueError(f"{path} is truncated: no header")
+        magic, typecode, count = HEADER.unpack_from(mapping)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a search tree file")
+        keys = array(typecode.decode())
+        if count < 0 or HEADER.size + count * keys.itemsize > len(mapping):
+            raise ValueError(f"{path} is truncated: header promises {count} keys")
+        with memoryview(mapping) as buffer:
+            keys.frombytes(buffer[HEADER.size:HEADER.size + count * keys.itemsize])
+    return keys
+
 
 class TreeNode:
     """Класс узла дерева"""
 
+    __slots__ = ('key', 'left', 'right')
+
     def __init__(self, key):
         self.key = key  # Ключ или значение узла
         self.left = None  # Левый потомок
@@ -16,68 +83,177 @@ class TreeNode:
 class BinarySearchTree:
     """Класс бинарного дерева поиска"""
 
+    node_class = TreeNode  # Класс узлов, которые создает insert
+
     def __init__(self):
         self.root = None  # Корень дерева
 
     def insert(self, key):
         """Вставка нового узла с заданным ключом"""
-        if self.root is None:
-            self.root = TreeNode(key)
-        else:
-            self._insert(self.root, key)
+        self._insert(key)
 
-    def _insert(self, node, key):
-        """Рекурсивная функция вставки"""
-        if key < node.key:
-            if node.left is None:
-                node.left = TreeNode(key)
-            else:
-                self._insert(node.left, key)
+    def _insert(self, key):
+        """Итеративная функция вставки, возвращает путь от корня до родителя нового узла"""
+        new_node = self.node_class(key)
+        if self.root is None:
+            self.root = new_node
+            return []
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
         else:
-            if node.right is None:
-                node.right = TreeNode(key)
-            else:
-                self._insert(node.right, key)
+            parent.right = new_node
+        return path
 
     def search(self, key):
         """Поиск узла с заданным ключом"""
-        return self._search(self.root, key)
-
-    def _search(self, node, key):
-        """Рекурсивная функция поиска"""
-        if node is None or node.key == key:
-            return node
-        if key < node.key:
-            return self._search(node.left, key)
-        else:
-            return self._search(node.right, key)
+        node = self.root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
 
     def delete(self, key):
         """Удаление узла с заданным ключом"""
-        self.root = self._delete(self.root, key)
+        self._delete(key)
 
-    def _delete(self, node, key):
-        """Рекурсивная функция удаления"""
+    def _delete(self, key):
+        """
+        Итеративная функция удаления.
+        Возвращает путь от корня до родителя удаленного узла или None, если ключа нет в дереве
+        """
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
         if node is None:
-            return node
+            return None
 
-        if key < node.key:
-            node.left = self._delete(node.left, key)
-        elif key > node.key:
-            node.right = self._delete(node.right, key)
+        if node.left is not None and node.right is not None:
+            # Узел с двумя потомками: получаем inorder-преемника (наименьший в правом поддереве),
+            # переносим его ключ и удаляем сам преемник - у него нет левого потомка
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            self._copy_node(node, successor)
+            node = successor
+
+        # Узел с одним потомком или без потомков заменяется своим потомком
+        child = node.left if node.left is not None else node.right
+        self._replace_child(path[-1] if path else None, node, child)
+        return path
+
+    def _copy_node(self, target, source):
+        """Переносит данные узла source в узел target"""
+        target.key = source.key
+
+    def _replace_child(self, parent, old, new):
+        """Ставит узел new на место потомка old узла parent (parent None - на место корня)"""
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
         else:
-            # Узел с одним потомком или без потомков
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
+            parent.right = new
 
-            # Узел с двумя потомками: получаем inorder-преемника (наименьший в правом поддереве)
-            temp = self._min_value_node(node.right)
-            node.key = temp.key
-            node.right = self._delete(node.right, temp.key)
+    def height(self):
+        """Высота дерева: число узлов на самом длинном пути от корня до листа"""
+        height = 0
+        level = [self.root] if self.root is not None else []
+        while level:
+            height += 1
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        return height
 
-        return node
+    @classmethod
+    def from_sorted(cls, keys):
+        """
+        Строит идеально сбалансированное дерево из ключей, упорядоченных по возрастанию, за O(n):
+        корнем поддерева становится средний ключ, левая и правая половины становятся поддеревьями
+        """
+        items = list(keys)
+        cls._check_sorted(items)
+        tree = cls()
+        # Вместо рекурсии - стек (начало, конец, родитель, правый ли потомок) еще не построенных поддеревьев
+        stack = [(0, len(items), None, False)] if items else []
+        while stack:
+            low, high, parent, is_right = stack.pop()
+            middle = (low + high) // 2
+            node = tree._node_from_item(items[middle])
+            tree._init_built_node(node, high - low)
+            if parent is None:
+                tree.root = node
+            elif is_right:
+                parent.right = node
+            else:
+                parent.left = node
+            if low < middle:
+                stack.append((low, middle, node, False))
+            if middle + 1 < high:
+                stack.append((middle + 1, high, node, True))
+        return tree
+
+    @classmethod
+    def bulk_load(cls, keys):
+        """Строит сбалансированное дерево из ключей в любом порядке: сортировка O(n log n) и from_sorted"""
+        return cls.from_sorted(sorted(keys))
+
+    def save(self, path, typecode='q'):
+        """Сохраняет ключи дерева по возрастанию в двоичный файл; typecode - тип ключей в модуле array"""
+        _write_keys(path, array(typecode, self.iter_inorder()))
+
+    @classmethod
+    def load(cls, path):
+        """Загружает сбалансированное дерево из двоичного файла; на время построения выключает сборщик мусора
+        всего процесса (gc.disable), затем возвращает его прежнее состояние"""
+        keys = _read_keys(path)
+        # Узлы не образуют циклов ссылок, а сборщик при создании миллионов объектов много раз обходил бы
+        # их все: с ним загрузка в 2-3 раза медленнее. Пока идет загрузка, он не работает и в других потоках
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return cls.from_sorted(keys.tolist())
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def union(self, other):
+        """Новое сбалансированное дерево из ключей двух деревьев: слияние упорядоченных обходов за O(n + m)"""
+        return type(self).from_sorted(self._merge(self, other))
+
+    def __iter__(self):
+        """Ленивый обход ключей по возрастанию"""
+        return self.iter_inorder()
+
+    def _iter_nodes(self):
+        """Ленивый обход узлов по возрастанию ключей со стеком вместо рекурсии"""
+        return iter_inorder_nodes(self.root)
+
+    @staticmethod
+    def _merge(first, second):
+        """Слияние двух упорядоченных последовательностей ключей, повторы сохраняются"""
+        return heapq.merge(first, second)
+
+    @staticmethod
+    def _check_sorted(items):
+        """Проверяет, что ключи идут по неубыванию"""
+        for i in range(1, len(items)):
+            if items[i] < items[i - 1]:
+                raise ValueError("keys are not sorted")
+
+    def _node_from_item(self, item):
+        """Создает узел для элемента входной последовательности from_sorted"""
+        return self.node_class(item)
+
+    def _init_built_node(self, node, count):
+        """Заполняет служебные поля узла, построенного from_sorted; count - число узлов в его поддереве"""
 
     def _min_value_node(self, node):
         """Получение узла с минимальным значением"""
@@ -88,41 +264,670 @@ class BinarySearchTree:
 
     def inorder(self):
         """Обход дерева в порядке возрастания (inorder traversal)"""
-        self._inorder(self.root)
+        for key in self.iter_inorder():
+            print(key, end=' ')
         print()
 
-    def _inorder(self, node):
-        """Рекурсивная функция inorder обхода"""
-        if node:
-            self._inorder(node.left)
-            print(node.key, end=' ')
-            self._inorder(node.right)
+    def iter_inorder(self):
+        """Генератор ключей inorder обхода (по возрастанию), стек вместо рекурсии"""
+        return iter_inorder(self.root)
+
+    def iter_preorder(self):
+        """Генератор ключей preorder обхода, стек вместо рекурсии"""
+        return iter_preorder(self.root)
+
+    def iter_postorder(self):
+        """Генератор ключей postorder обхода, стек вместо рекурсии"""
+        return iter_postorder(self.root)
+
+    def iter_morris_inorder(self):
+        """Генератор ключей inorder обхода Морриса с O(1) дополнительной памяти, см. tree_traversal.py"""
+        return iter_morris_inorder(self.root)
+
+
+class AVLNode(TreeNode):
+    """Класс узла АВЛ-дерева"""
+
+    __slots__ = ('height',)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.height = 1  # Высота поддерева с корнем в этом узле
+
+
+class AVLTree(BinarySearchTree):
+    """Класс сбалансированного бинарного дерева поиска (АВЛ-дерево)"""
+
+    node_class = AVLNode
+
+    def insert(self, key):
+        """Вставка нового узла с заданным ключом и балансировка"""
+        self._rebalance_path(self._insert(key))
+
+    def delete(self, key):
+        """Удаление узла с заданным ключом и балансировка"""
+        path = self._delete(key)
+        if path is not None:
+            self._rebalance_path(path)
+
+    def height(self):
+        """Высота дерева, хранится в корне"""
+        return self._height(self.root)
+
+    def _init_built_node(self, node, count):
+        # Половины отличаются не больше чем на один узел, поэтому высота поддерева - число двоичных разрядов count
+        node.height = count.bit_length()
+
+    def _rebalance_path(self, path):
+        """
+        Обновляет высоты и восстанавливает баланс узлов пути снизу вверх.
+        Возвращает число узлов в начале пути, до которых балансировка не дошла
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            new_node = self._rebalance(node)
+            if new_node is not node:
+                self._replace_child(path[i - 1] if i > 0 else None, node, new_node)
+            # Высота поддерева не изменилась - выше по пути ничего не меняется
+            if new_node.height == old_height:
+                return i
+        return 0
+
+    def _rebalance(self, node):
+        """Восстанавливает баланс узла, возвращает новый корень поддерева"""
+        self._update_height(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            # Левое поддерево выше: при перекосе левого потомка вправо нужен двойной поворот
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _rotate_right(self, node):
+        """Правый поворот: левый потомок становится корнем поддерева"""
+        top = node.left
+        node.left = top.right
+        top.right = node
+        self._update_height(node)
+        self._update_height(top)
+        return top
+
+    def _rotate_left(self, node):
+        """Левый поворот: правый потомок становится корнем поддерева"""
+        top = node.right
+        node.right = top.left
+        top.left = node
+        self._update_height(node)
+        self._update_height(top)
+        return top
+
+    @staticmethod
+    def _height(node):
+        """Высота поддерева, у пустого поддерева 0"""
+        return node.height if node is not None else 0
+
+    def _update_height(self, node):
+        """Пересчитывает высоту узла по высотам потомков"""
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+
+
+class OrderedMapNode(AVLNode):
+    """Класс узла упорядоченного словаря"""
+
+    __slots__ = ('value', 'size')
+
+    def __init__(self, key, value=None):
+        super().__init__(key)
+        self.value = value  # Значение, связанное с ключом
+        self.size = 1  # Число узлов в поддереве с корнем в этом узле
+
+
+class OrderedMap(AVLTree):
+    """Упорядоченный словарь на АВЛ-дереве с размерами поддеревьев"""
+
+    node_class = OrderedMapNode
+
+    def insert(self, key, value=None):
+        """Вставка ключа со значением; если ключ уже есть, заменяется его значение"""
+        node = self.search(key)
+        if node is not None:
+            node.value = value
+            return
+        path = self._insert(key)
+        if not path:
+            node = self.root
+        elif key < path[-1].key:
+            node = path[-1].left
+        else:
+            node = path[-1].right
+        node.value = value
+        self._rebalance_path(path)
+
+    def get(self, key, default=None):
+        """Значение по ключу или default, если ключа нет"""
+        node = self.search(key)
+        return node.value if node is not None else default
+
+    def __getitem__(self, key):
+        node = self.search(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        path = self._delete(key)
+        if path is None:
+            raise KeyError(key)
+        self._rebalance_path(path)
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def __len__(self):
+        return self._size(self.root)
+
+    def items(self, low=None, high=None):
+        """Ленивый обход пар (ключ, значение) по возрастанию ключей, low <= ключ <= high (None - без границы)"""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if node is not None:
+                if low is not None and node.key < low:
+                    # Все левое поддерево меньше low
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                if high is not None and node.key > high:
+                    return
+                yield node.key, node.value
+                node = node.right
+
+    def floor(self, key):
+        """Наибольший ключ, не больше key, или None"""
+        result = None
+        node = self.root
+        while node is not None:
+            if node.key == key:
+                return key
+            if node.key < key:
+                result = node.key
+                node = node.right
+            else:
+                node = node.left
+        return result
+
+    def ceiling(self, key):
+        """Наименьший ключ, не меньше key, или None"""
+        result = None
+        node = self.root
+        while node is not None:
+            if node.key == key:
+                return key
+            if node.key > key:
+                result = node.key
+                node = node.left
+            else:
+                node = node.right
+        return result
+
+    def rank(self, key):
+        """Число ключей меньше key"""
+        rank = 0
+        node = self.root
+        while node is not None:
+            if key <= node.key:
+                node = node.left
+            else:
+                rank += self._size(node.left) + 1
+                node = node.right
+        return rank
+
+    def select(self, index):
+        """Ключ с номером index по возрастанию (с нуля)"""
+        if not 0 <= index < len(self):
+            raise IndexError("index out of range")
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.key
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    @classmethod
+    def bulk_load(cls, items):
+        """Строит словарь из пар (ключ, значение) в любом порядке; при повторе ключа остается последнее значение"""
+        return cls.from_sorted(sorted(dict(items).items()))
+
+    def save(self, path, typecode='q'):
+        """Двоичный формат хранит только ключи, значения словаря в нем сохранить нельзя"""
+        raise TypeError("OrderedMap values can not be saved to the binary key format")
+
+    @classmethod
+    def load(cls, path):
+        """Двоичный формат хранит только ключи, словарь из него не восстановить"""
+        raise TypeError("OrderedMap values can not be loaded from the binary key format")
+
+    @staticmethod
+    def _merge(first, second):
+        """Слияние двух упорядоченных потоков пар (ключ, значение); при совпадении ключа берется значение second"""
+        first, second = first.items(), second.items()
+        a = next(first, None)
+        b = next(second, None)
+        while a is not None and b is not None:
+            if a[0] < b[0]:
+                yield a
+                a = next(first, None)
+            elif b[0] < a[0]:
+                yield b
+                b = next(second, None)
+            else:
+                yield b
+                a = next(first, None)
+                b = next(second, None)
+        if a is not None:
+            yield a
+            yield from first
+        if b is not None:
+            yield b
+            yield from second
+
+    @staticmethod
+    def _check_sorted(items):
+        """Проверяет, что ключи пар идут строго по возрастанию"""
+        for i in range(1, len(items)):
+            if not items[i - 1][0] < items[i][0]:
+                raise ValueError("keys are not sorted or repeat")
+
+    def _node_from_item(self, item):
+        key, value = item
+        return self.node_class(key, value)
+
+    def _init_built_node(self, node, count):
+        super()._init_built_node(node, count)
+        node.size = count
+
+    def _rebalance_path(self, path):
+        """Балансировка пути; размеры меняются у всех узлов пути, даже там, где высоты остались прежними"""
+        stop = super()._rebalance_path(path)
+        for i in range(stop - 1, -1, -1):
+            self._update_size(path[i])
+        return stop
+
+    def _copy_node(self, target, source):
+        target.key = source.key
+        target.value = source.value
+
+    @staticmethod
+    def _size(node):
+        """Размер поддерева, у пустого поддерева 0"""
+        return node.size if node is not None else 0
+
+    def _update_size(self, node):
+        """Пересчитывает размер поддерева узла по размерам потомков"""
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+
+    def _update_height(self, node):
+        super()._update_height(node)
+        self._update_size(node)
+
+
+class ArrayBinarySearchTree:
+    """Бинарное дерево поиска в виде структуры массивов: узел - номер позиции в массивах keys, left, right"""
+
+    def __init__(self, typecode='q'):
+        self.keys = array(typecode)  # Ключи узлов, typecode - тип элементов массива (по умолчанию int64)
+        self.left = array('q')  # Номер левого потомка или -1
+        self.right = array('q')  # Номер правого потомка или -1
+        self.root = -1  # Номер корня, -1 - дерево пусто
+        self.free = -1  # Начало списка освобожденных позиций, связанного через массив left
+        self.size = 0  # Число узлов
+
+    def insert(self, key):
+        """Вставка нового узла с заданным ключом"""
+        new_node = self._allocate(key)
+        if self.root == -1:
+            self.root = new_node
+            return
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while True:
+            if key < keys[node]:
+                if left[node] == -1:
+                    left[node] = new_node
+                    return
+                node = left[node]
+            else:
+                if right[node] == -1:
+                    right[node] = new_node
+                    return
+                node = right[node]
+
+    def search(self, key):
+        """Поиск узла с заданным ключом, возвращает номер узла или None"""
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while node != -1:
+            node_key = keys[node]
+            if node_key == key:
+                return node
+            node = left[node] if key < node_key else right[node]
+        return None
+
+    def delete(self, key):
+        """Удаление узла с заданным ключом"""
+        keys, left, right = self.keys, self.left, self.right
+        parent = -1
+        node = self.root
+        while node != -1 and keys[node] != key:
+            parent = node
+            node = left[node] if key < keys[node] else right[node]
+        if node == -1:
+            return
+
+        if left[node] != -1 and right[node] != -1:
+            # Узел с двумя потомками: переносим ключ inorder-преемника и удаляем сам преемник
+            parent = node
+            successor = right[node]
+            while left[successor] != -1:
+                parent = successor
+                successor = left[successor]
+            keys[node] = keys[successor]
+            node = successor
+
+        child = left[node] if left[node] != -1 else right[node]
+        if parent == -1:
+            self.root = child
+        elif left[parent] == node:
+            left[parent] = child
+        else:
+            right[parent] = child
+        self._release(node)
+
+    @classmethod
+    def from_sorted(cls, keys, typecode='q'):
+        """Строит идеально сбалансированное дерево из ключей, упорядоченных по возрастанию, за O(n)"""
+        tree = cls(typecode)
+        # Узел с номером i хранит i-й ключ: массив ключей - это сами упорядоченные ключи
+        tree.keys.extend(keys)
+        count = len(tree.keys)
+        for i in range(1, count):
+            if tree.keys[i] < tree.keys[i - 1]:
+                raise ValueError("keys are not sorted")
+        tree.left = array('q', [-1]) * count
+        tree.right = array('q', [-1]) * count
+        tree.size = count
+        if count:
+            tree.root = (count - 1) // 2
+        left, right = tree.left, tree.right
+        stack = [(0, count)] if count else []
+        while stack:
+            low, high = stack.pop()
+            middle = (low + high - 1) // 2
+            if low < middle:
+                left[middle] = (low + middle - 1) // 2
+                stack.append((low, middle))
+            if middle + 1 < high:
+                right[middle] = (middle + high) // 2
+                stack.append((middle + 1, high))
+        return tree
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """Ленивый обход ключей по возрастанию со стеком вместо рекурсии"""
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        node = self.root
+        while stack or node != -1:
+            if node != -1:
+                stack.append(node)
+                node = left[node]
+            else:
+                node = stack.pop()
+                yield keys[node]
+                node = right[node]
+
+    def inorder(self):
+        """Обход дерева в порядке возрастания (inorder traversal)"""
+        print(*self)
+
+    def height(self):
+        """Высота дерева: число узлов на самом длинном пути от корня до листа"""
+        height = 0
+        level = [self.root] if self.root != -1 else []
+        while level:
+            height += 1
+            level = [child for node in level for child in (self.left[node], self.right[node]) if child != -1]
+        return height
+
+    def save(self, path):
+        """Сохраняет ключи дерева по возрастанию в двоичный файл того же формата, что BinarySearchTree.save"""
+        _write_keys(path, array(self.keys.typecode, self))
+
+    @classmethod
+    def load(cls, path):
+        """Загружает сбалансированное дерево из двоичного файла: ключи копируются в массив без разбора по одному"""
+        keys = _read_keys(path)
+        return cls.from_sorted(keys, keys.typecode)
+
+    def nbytes(self):
+        """Размер массивов дерева в байтах"""
+        return sum(len(part) * part.itemsize for part in (self.keys, self.left, self.right))
+
+    def _allocate(self, key):
+        """Занимает позицию под новый узел: освобожденную, если есть, иначе в конце массивов"""
+        self.size += 1
+        if self.free != -1:
+            node = self.free
+            self.free = self.left[node]
+            self.keys[node] = key
+            self.left[node] = self.right[node] = -1
+            return node
+        self.keys.append(key)
+        self.left.append(-1)
+        self.right.append(-1)
+        return len(self.keys) - 1
+
+    def _release(self, node):
+        """Добавляет позицию удаленного узла в список свободных"""
+        self.size -= 1
+        self.left[node] = self.free
+        self.right[node] = -1
+        self.free = node
 
 
 # Пример использования
-bst = BinarySearchTree()
-bst.insert(50)
-bst.insert(30)
-bst.insert(70)
-bst.insert(20)
-bst.insert(40)
-bst.insert(60)
-bst.insert(80)
-
-print("Inorder traversal после вставки:")
-bst.inorder()  # Вывод: 20 30 40 50 60 70 80
-
-print("Поиск 40:", bst.search(40) is not None)  # Вывод: Поиск 40: True
-print("Поиск 90:", bst.search(90) is not None)  # Вывод: Поиск 90: False
-
-bst.delete(20)
-print("Inorder traversal после удаления 20:")
-bst.inorder()  # Вывод: 30 40 50 60 70 80
-
-bst.delete(30)
-print("Inorder traversal после удаления 30:")
-bst.inorder()  # Вывод: 40 50 60 70 80
-
-bst.delete(50)
-print("Inorder traversal после удаления 50:")
-bst.inorder()  # Вывод: 40 60 70 80
+if __name__ == "__main__":
+    import os
+    import random
+    import sys
+    import tempfile
+    import time
+
+    bst = BinarySearchTree()
+    bst.insert(50)
+    bst.insert(30)
+    bst.insert(70)
+    bst.insert(20)
+    bst.insert(40)
+    bst.insert(60)
+    bst.insert(80)
+
+    print("Inorder traversal после вставки:")
+    bst.inorder()  # Вывод: 20 30 40 50 60 70 80
+
+    print("Поиск 40:", bst.search(40) is not None)  # Вывод: Поиск 40: True
+    print("Поиск 90:", bst.search(90) is not None)  # Вывод: Поиск 90: False
+
+    bst.delete(20)
+    print("Inorder traversal после удаления 20:")
+    bst.inorder()  # Вывод: 30 40 50 60 70 80
+
+    bst.delete(30)
+    print("Inorder traversal после удаления 30:")
+    bst.inorder()  # Вывод: 40 50 60 70 80
+
+    bst.delete(50)
+    print("Inorder traversal после удаления 50:")
+    bst.inorder()  # Вывод: 40 60 70 80
+
+    # Сравнение обычного и сбалансированного дерева
+    print()
+    sorted_bst = BinarySearchTree()
+    sorted_avl = AVLTree()
+    for key in range(1000):
+        sorted_bst.insert(key)
+        sorted_avl.insert(key)
+    print("Высота после вставки 1000 ключей по возрастанию:", sorted_bst.height(), sorted_avl.height())
+    # Вывод: Высота после вставки 1000 ключей по возрастанию: 1000 10
+
+    count = 10 ** 4
+    start_time = time.time()
+    sorted_bst = BinarySearchTree()
+    for key in range(count):
+        sorted_bst.insert(key)
+    elapsed_time = time.time() - start_time
+    print(f'Обычное дерево, {count} ключей по возрастанию. Высота: {sorted_bst.height()}. '
+          f'Время в мс:{elapsed_time * 1000:.4f}')
+
+    # Рекурсивный обход дерева высотой 10^4 превысил бы предел глубины рекурсии, генераторы работают на любой высоте
+    print("Обход вырожденного дерева:",
+          sum(1 for _ in sorted_bst.iter_inorder()), sum(1 for _ in sorted_bst.iter_postorder()),
+          "узлов, первые ключи Морриса:", [key for key, _ in zip(sorted_bst.iter_morris_inorder(), range(3))])
+    # Вывод: Обход вырожденного дерева: 10000 10000 узлов, первые ключи Морриса: [0, 1, 2]
+
+    count = 10 ** 6
+    random_keys = random.Random(17).sample(range(count), count)
+    for name, keys in (("по возрастанию", range(count)), ("в случайном порядке", random_keys)):
+        avl = AVLTree()
+        start_time = time.time()
+        for key in keys:
+            avl.insert(key)
+        elapsed_time = time.time() - start_time
+        print(f'АВЛ-дерево, вставка {count} ключей {name}. Высота: {avl.height()}. '
+              f'Время в мс:{elapsed_time * 1000:.4f}')
+
+        start_time = time.time()
+        found = sum(avl.search(key) is not None for key in random_keys)
+        elapsed_time = time.time() - start_time
+        print(f'АВЛ-дерево, поиск {count} ключей. Найдено: {found}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    for key in random_keys[:count // 2]:
+        avl.delete(key)
+    elapsed_time = time.time() - start_time
+    print(f'АВЛ-дерево, удаление {count // 2} ключей. Высота: {avl.height()}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    # Упорядоченный словарь
+    print()
+    prices = OrderedMap()
+    for key, value in ((50, 'a'), (30, 'b'), (70, 'c'), (20, 'd'), (40, 'e'), (60, 'f'), (80, 'g')):
+        prices[key] = value
+    print("Ключи от 35 до 65:", list(prices.items(35, 65)))  # Вывод: [(40, 'e'), (50, 'a'), (60, 'f')]
+    print("floor(55), ceiling(55):", prices.floor(55), prices.ceiling(55))  # Вывод: 50 60
+    print("rank(55), select(2):", prices.rank(55), prices.select(2))  # Вывод: 4 40
+
+    count = 10 ** 5
+    ordered_map = OrderedMap()
+    for key in random_keys[:count]:
+        ordered_map[key] = str(key)
+    queries = [random.Random(18).randrange(count * 10) for _ in range(count)]
+
+    start_time = time.time()
+    for key in queries:
+        ordered_map.select(ordered_map.rank(key) % count)
+    elapsed_time = time.time() - start_time
+    print(f'Упорядоченный словарь, {count} ключей. rank + select {len(queries)} раз. '
+          f'Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    for key in queries[:1000]:
+        for _ in zip(ordered_map.items(key), range(100)):
+            pass
+    elapsed_time = time.time() - start_time
+    print(f'Ленивый итератор: 100 ключей от заданного, 1000 запросов. Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    for key in queries[:10]:
+        [item for item in ordered_map.items() if item[0] >= key][:100]
+    elapsed_time = time.time() - start_time
+    print(f'Полный обход: 100 ключей от заданного, 10 запросов. Время в мс:{elapsed_time * 1000:.4f}')
+
+    # Построение дерева без вставок
+    print()
+    print("Построение из упорядоченных ключей:", list(AVLTree.from_sorted([1, 2, 3, 4, 5, 6, 7])))
+    # Вывод: Построение из упорядоченных ключей: [1, 2, 3, 4, 5, 6, 7]
+
+    # Освобождаем большие деревья из прошлых замеров, чтобы их обход сборщиком мусора не попадал в замеры
+    del avl, ordered_map
+    count = 10 ** 6
+    start_time = time.time()
+    avl = AVLTree.from_sorted(range(count))
+    elapsed_time = time.time() - start_time
+    print(f'АВЛ-дерево, from_sorted {count} ключей. Высота: {avl.height()}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    del avl
+    start_time = time.time()
+    avl = AVLTree.bulk_load(random_keys)
+    elapsed_time = time.time() - start_time
+    print(f'АВЛ-дерево, bulk_load {count} ключей в случайном порядке. Высота: {avl.height()}. '
+          f'Время в мс:{elapsed_time * 1000:.4f}')
+    del avl
+
+    first = OrderedMap.bulk_load((key, 'first') for key in random_keys[:count // 2])
+    second = OrderedMap.bulk_load((key, 'second') for key in random_keys[count // 4:count * 3 // 4])
+    start_time = time.time()
+    merged = first.union(second)
+    elapsed_time = time.time() - start_time
+    print(f'Объединение словарей по {count // 2} ключей. Ключей: {len(merged)}. Время в мс:{elapsed_time * 1000:.4f}')
+
+    # Память на узел
+    count = 10 ** 7
+    array_tree = ArrayBinarySearchTree.from_sorted(range(count))
+    print(f'Структура массивов, {count} узлов. Байт на узел: {array_tree.nbytes() / count:.1f}')
+    del array_tree
+    object_tree = BinarySearchTree.from_sorted(range(count))
+    object_bytes = sum(sys.getsizeof(node) + sys.getsizeof(node.key) for node in object_tree._iter_nodes())
+    print(f'Узлы-объекты с __slots__, {count} узлов. Байт на узел: {object_bytes / count:.1f}')
+    del object_tree
+
+    # Сохранение и загрузка
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "keys.bin")
+    avl = AVLTree.bulk_load(random_keys)
+    start_time = time.time()
+    avl.save(path)
+    elapsed_time = time.time() - start_time
+    print(f'Сохранение АВЛ-дерева, {len(random_keys)} ключей. Размер файла, МБ: {os.path.getsize(path) / 2 ** 20:.1f}. '
+          f'Время в мс:{elapsed_time * 1000:.4f}')
+
+    start_time = time.time()
+    loaded = AVLTree.load(path)
+    elapsed_time = time.time() - start_time
+    print(f'Загрузка АВЛ-дерева. Высота: {loaded.height()}. Время в мс:{elapsed_time * 1000:.4f}')
+    print("Ключи совпадают:", all(a == b for a, b in zip(loaded, avl)))
+    del avl, loaded
+
+    start_time = time.time()
+    array_tree = ArrayBinarySearchTree.load(path)
+    elapsed_time = time.time() - start_time
+    print(f'Загрузка дерева-структуры массивов. Высота: {array_tree.height()}. Время в мс:{elapsed_time * 1000:.4f}')
+    os.remove(path)
+    os.rmdir(directory)
@@ -1,5 +1,23 @@
+import gc
+import mmap
+import struct
+from array import array
+from collections import deque
+
+from .tree_traversal import iter_inorder, iter_morris_inorder, iter_postorder, iter_preorder
+
+# Двоичный формат дерева (save/load): заголовок 16 байт - сигнатура b'BTLO', тип ключей (typecode модуля array),
+# 3 пустых байта и число узлов (int64); затем ключи узлов в порядке обхода по уровням и по байту на узел:
+# бит 1 - есть левый потомок, бит 2 - есть правый. Это обход по уровням с пометками пустых мест:
+# по пометкам потомки узлов однозначно восстанавливаются из следующих по порядку ключей.
+MAGIC = b'BTLO'
+HEADER = struct.Struct('<4sc3xq')
+
+
 class TreeNode:
     """Класс узла дерева"""
+    __slots__ = ('key', 'left', 'right')
+
     def __init__(self, key):
         self.key = key      # Ключ или значение узла
         self.left = None    # Левый потомок
@@ -7,36 +25,39 @@ class TreeNode:
 
 class BinaryTree:
     """Класс бинарного дерева"""
-    def __init__(self):
+    def __init__(self, index=False):
         self.root = None    # Корень дерева
+        # Узлы, у которых есть место для потомка, в порядке обхода по уровням.
+        # Первый из них - родитель следующего вставленного узла, поэтому вставка не ищет место обходом дерева
+        self.free_parents = deque()
+        self.index = {} if index else None    # Ключ -> первый узел с этим ключом, если дерево создано с index=True
 
     def insert(self, key):
-        """Вставка нового узла с заданным ключом в первое свободное место"""
+        """Вставка нового узла с заданным ключом в первое свободное место за O(1), дерево остается полным"""
         new_node = TreeNode(key)
         if self.root is None:
             self.root = new_node
         else:
-            queue = [self.root]
-            while queue:
-                node = queue.pop(0)
-                if node.left is None:
-                    node.left = new_node
-                    break
-                else:
-                    queue.append(node.left)
-                if node.right is None:
-                    node.right = new_node
-                    break
-                else:
-                    queue.append(node.right)
+            parent = self.free_parents[0]
+            if parent.left is None:
+                parent.left = new_node
+            else:
+                parent.right = new_node
+            if parent.left is not None and parent.right is not None:
+                self.free_parents.popleft()    # У родителя заняты оба места
+        self.free_parents.append(new_node)
+        if self.index is not None:
+            self.index.setdefault(key, new_node)
 
     def search(self, key):
-        """Поиск узла с заданным ключом"""
+        """Поиск узла с заданным ключом: по индексу за O(1) или обходом по уровням за O(n)"""
+        if self.index is not None:
+            return self.index.get(key)
         if self.root is None:
             return None
-        queue = [self.root]
+        queue = deque([self.root])
         while queue:
-            node = queue.pop(0)
+            node = queue.popleft()
             if node.key == key:
                 return node
             if node.left is not None:
@@ -45,58 +66,177 @@ class BinaryTree:
                 queue.append(node.right)
         return None
 
+    def save(self, path, typecode='q'):
+        """Сохраняет дерево в двоичный файл; typecode - тип ключей в модуле array, по умолчанию int64"""
+        keys = array(typecode)
+        flags = bytearray()
+        queue = deque([self.root] if self.root is not None else [])
+        while queue:
+            node = queue.popleft()
+            keys.append(node.key)
+            flags.append((node.left is not None) | (node.right is not None) << 1)
+            if node.left is not None:
+                queue.append(node.left)
+            if node.right is not None:
+                queue.append(node.right)
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, typecode.encode(), len(keys)))
+            keys.tofile(file)
+            file.write(flags)
+
+    @classmethod
+    def load(cls, path, index=False):
+        """Загружает дерево из двоичного файла: файл отображается в память (mmap), узлы создаются одним проходом.
+
+        Побочный эффект: пока создаются узлы, сборщик мусора выключен для всего процесса, в том числе
+        для других потоков; после построения его состояние восстанавливается. Узлы не образуют циклов,
+        а сборщик обходил бы миллионы новых объектов много раз. Для усеченного файла - ValueError.
+        """
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            if len(mapping) < HEADER.size:
+                raise ValueError(f"{path} is truncated: no header")
+            magic, typecode, count = HEADER.unpack_from(mapping)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a binary tree file")
+            typecode = typecode.decode()
+            start = HEADER.size
+            end = start + count * array(typecode).itemsize
+            if count < 0 or end + count > len(mapping):
+                raise ValueError(f"{path} is truncated: header promises {count} nodes")
+            with memoryview(mapping) as buffer:
+                keys = buffer[start:end].cast(typecode).tolist()
+                flags = bytes(buffer[end:end + count])
+
+        tree = cls(index=index)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            nodes = [TreeNode(key) for key in keys]
+            child = 1    # Номер следующего по порядку узла - очередного потомка
+            for node, flag in zip(nodes, flags):
+                if flag & 1:
+                    node.left = nodes[child]
+                    child += 1
+                if flag & 2:
+                    node.right = nodes[child]
+                    child += 1
+                if flag != 3:
+                    tree.free_parents.append(node)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if nodes:
+            tree.root = nodes[0]
+        if tree.index is not None:
+            for node in reversed(nodes):
+                tree.index[node.key] = node    # При повторе ключа остается первый узел в порядке по уровням
+        return tree
+
     def inorder(self):
         """Обход дерева в порядке Левый потомок, Корень, Правый потомок (inorder traversal)"""
-        self._inorder(self.root)
+        for key in self.iter_inorder():
+            print(key, end=' ')
         print()
 
-    def _inorder(self, node):
-        """Рекурсивная функция inorder обхода"""
-        if node:
-            self._inorder(node.left)
-            print(node.key, end=' ')
-            self._inorder(node.right)
-
     def preorder(self):
         """Обход дерева в порядке прямого обхода Корень, Левый потомок, Правый потомок (preorder traversal)"""
-        self._preorder(self.root)
+        for key in self.iter_preorder():
+            print(key, end=' ')
         print()
 
-    def _preorder(self, node):
-        """Рекурсивная функция preorder обхода"""
-        if node:
-            print(node.key, end=' ')
-            self._preorder(node.left)
-            self._preorder(node.right)
-
     def postorder(self):
         """Обход дерева в порядке обратного обхода Левый потомок, Правый потомок, Корень. (postorder traversal)"""
-        self._postorder(self.root)
+        for key in self.iter_postorder():
+            print(key, end=' ')
         print()
 
-    def _postorder(self, node):
-        """Рекурсивная функция postorder обхода"""
-        if node:
-            self._postorder(node.left)
-            self._postorder(node.right)
-            print(node.key, end=' ')
+    def iter_inorder(self):
+        """Генератор ключей inorder обхода, стек вместо рекурсии"""
+        return iter_inorder(self.root)
+
+    def iter_preorder(self):
+        """Генератор ключей preorder обхода, стек вместо рекурсии"""
+        return iter_preorder(self.root)
+
+    def iter_postorder(self):
+        """Генератор ключей postorder обхода, стек вместо рекурсии"""
+        return iter_postorder(self.root)
+
+    def iter_morris_inorder(self):
+        """Генератор ключей inorder обхода Морриса с O(1) дополнительной памяти, см. tree_traversal.py"""
+        return iter_morris_inorder(self.root)
+
 
 # Пример использования
-bt = BinaryTree()
-bt.insert(1)
-bt.insert(2)
-bt.insert(3)
-bt.insert(4)
-bt.insert(5)
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    bt = BinaryTree()
+    bt.insert(1)
+    bt.insert(2)
+    bt.insert(3)
+    bt.insert(4)
+    bt.insert(5)
+
+    print("Inorder traversal:")
+    bt.inorder()  # Вывод: 4 2 5 1 3
+
+    print("Preorder traversal:")
+    bt.preorder() # Вывод: 1 2 4 5 3
+
+    print("Postorder traversal:")
+    bt.postorder()# Вывод: 4 5 2 3 1
+
+    print("Поиск 4:", bt.search(4) is not None)  # Вывод: Поиск 4: True
+    print("Поиск 6:", bt.search(6) is not None)  # Вывод: Поиск 6: False
+
+    # Замеры
+    count = 10 ** 6
+    for index in (False, True):
+        start_time = time.time()
+        bt = BinaryTree(index=index)
+        for key in range(count):
+            bt.insert(key)
+        elapsed_time = time.time() - start_time
+        print(f'Вставка {count} узлов, индекс: {index}. Время в мс:{elapsed_time * 1000:.4f}')
+
+        start_time = time.time()
+        for key in (count // 2, count - 1, count):
+            bt.search(key)
+        elapsed_time = time.time() - start_time
+        print(f'Поиск 3 ключей, индекс: {index}. Время в мс:{elapsed_time * 1000:.4f}')
 
-print("Inorder traversal:")
-bt.inorder()  # Вывод: 4 2 5 1 3
+    # Потоковый обход большого дерева
+    count = 10 ** 7
+    bt = BinaryTree()
+    for key in range(count):
+        bt.insert(key)
+    for name, traversal in (("inorder", bt.iter_inorder), ("preorder", bt.iter_preorder),
+                            ("postorder", bt.iter_postorder), ("Моррис inorder", bt.iter_morris_inorder)):
+        start_time = time.time()
+        total = sum(traversal())
+        elapsed_time = time.time() - start_time
+        print(f'Обход {name}, {count} узлов. Сумма ключей: {total}. Время в мс:{elapsed_time * 1000:.4f}')
 
-print("Preorder traversal:")
-bt.preorder() # Вывод: 1 2 4 5 3
+    start_time = time.time()
+    first_keys = [key for key, _ in zip(bt.iter_inorder(), range(5))]  # Обход останавливается после 5 ключей
+    elapsed_time = time.time() - start_time
+    print(f'Первые 5 ключей inorder: {first_keys}. Время в мс:{elapsed_time * 1000:.4f}')
 
-print("Postorder traversal:")
-bt.postorder()# Вывод: 4 5 2 3 1
+    # Сохранение и загрузка
+    path = os.path.join(tempfile.mkdtemp(), "tree.bin")
+    start_time = time.time()
+    bt.save(path)
+    elapsed_time = time.time() - start_time
+    print(f'Сохранение {count} узлов. Размер файла, МБ: {os.path.getsize(path) / 2 ** 20:.1f}. '
+          f'Время в мс:{elapsed_time * 1000:.4f}')
 
-print("Поиск 4:", bt.search(4) is not None)  # Вывод: Поиск 4: True
-print("Поиск 6:", bt.search(6) is not None)  # Вывод: Поиск 6: False
+    start_time = time.time()
+    loaded = BinaryTree.load(path)
+    elapsed_time = time.time() - start_time
+    print(f'Загрузка {count} узлов. Время в мс:{elapsed_time * 1000:.4f}')
+    print("Обход совпадает:", all(a == b for a, b in zip(loaded.iter_preorder(), bt.iter_preorder())))
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
@@ -38,8 +38,29 @@ Python List (Встроенный Список)
 но эффективен для операций вставки/удаления.
 '''
 
+# Список хранит ссылки на первый (head) и последний (tail) узлы и число элементов, поэтому добавление в конец
+# и длина списка не требуют прохода по узлам и выполняются за O(1).
+# В двусвязном списке (DoublyLinkedList) узел ссылается еще и на предыдущий узел. Тогда за O(1) выполняются
+# добавление и удаление с обоих концов и удаление узла, на который уже есть ссылка (например, сохраненной при
+# добавлении): соседи узла известны, искать их проходом по списку не нужно. У list и collections.deque
+# удаление элемента из середины - это поиск значения и сдвиг элементов, O(n).
+# Узлы объявлены с __slots__: без словаря атрибутов __dict__ каждый узел занимает заметно меньше памяти.
+#
+# Развернутый связный список (UnrolledLinkedList) хранит в каждом узле не один элемент, а блок до block_size
+# элементов подряд. Ссылок и объектов-узлов становится в block_size раз меньше: элемент обходится почти как
+# в list (одна ссылка в массиве), а обход идет по непрерывным массивам, а не по разбросанным в памяти узлам.
+# Курсор (UnrolledCursor) указывает на блок и место в нем: вставка и удаление у курсора сдвигают элементы
+# только внутри одного блока, то есть стоят O(block_size) = O(1) при фиксированном размере блока.
+# Полный блок при вставке делится пополам. Если после удаления в блоке остается меньше половины block_size
+# элементов, он сливается со следующим блоком или забирает из него элемент. Поэтому все блоки, кроме последнего,
+# заполнены хотя бы наполовину, и блоков не больше 2 * n / block_size + 1.
+
+from itertools import chain
+
 class Node:
     """Класс узла связного списка"""
+    __slots__ = ('data', 'next')
+
     def __init__(self, data=None):
         self.data = data  # Данные узла
         self.next = None  # Ссылка на следующий узел
@@ -48,31 +69,405 @@ class LinkedList:
     """Класс односвязного списка"""
     def __init__(self):
         self.head = None  # Изначально список пуст
+        self.tail = None  # Последний узел
+        self.size = 0     # Число элементов
 
     def append(self, data):
-        """Метод для добавления элемента в конец списка"""
+        """Метод для добавления элемента в конец списка за O(1), возвращает новый узел"""
         new_node = Node(data)
         if not self.head:  # Если список пуст, новый узел становится головой
             self.head = new_node
-            return
-        last = self.head
-        while last.next:  # Ищем последний узел
-            last = last.next
-        last.next = new_node  # Добавляем новый узел в конец
+        else:
+            self.tail.next = new_node  # Добавляем новый узел после последнего
+        self.tail = new_node
+        self.size += 1
+        return new_node
 
-    def display(self):
-        """Метод для отображения элементов списка"""
-        elements = []
+    def appendleft(self, data):
+        """Метод для добавления элемента в начало списка за O(1), возвращает новый узел"""
+        new_node = Node(data)
+        new_node.next = self.head
+        self.head = new_node
+        if self.tail is None:
+            self.tail = new_node
+        self.size += 1
+        return new_node
+
+    def popleft(self):
+        """Метод для удаления и возврата первого элемента списка за O(1)"""
+        if self.head is None:
+            raise IndexError("pop from an empty list")
+        node = self.head
+        self.head = node.next
+        if self.head is None:
+            self.tail = None
+        self.size -= 1
+        return node.data
+
+    def __iter__(self):
         current = self.head
         while current:
-            elements.append(current.data)
+            yield current.data
             current = current.next
-        print("Список:", elements)
+
+    def __len__(self):
+        return self.size
+
+    def display(self):
+        """Метод для отображения элементов списка"""
+        print("Список:", list(self))
+
+class DoublyNode(Node):
+    """Класс узла двусвязного списка"""
+    __slots__ = ('prev',)
+
+    def __init__(self, data=None):
+        super().__init__(data)
+        self.prev = None  # Ссылка на предыдущий узел
+
+class DoublyLinkedList(LinkedList):
+    """Класс двусвязного списка"""
+
+    def append(self, data):
+        """Метод для добавления элемента в конец списка за O(1), возвращает новый узел"""
+        new_node = DoublyNode(data)
+        new_node.prev = self.tail
+        if self.tail is None:
+            self.head = new_node
+        else:
+            self.tail.next = new_node
+        self.tail = new_node
+        self.size += 1
+        return new_node
+
+    def appendleft(self, data):
+        """Метод для добавления элемента в начало списка за O(1), возвращает новый узел"""
+        new_node = DoublyNode(data)
+        new_node.next = self.head
+        if self.head is None:
+            self.tail = new_node
+        else:
+            self.head.prev = new_node
+        self.head = new_node
+        self.size += 1
+        return new_node
+
+    def pop(self):
+        """Метод для удаления и возврата последнего элемента списка за O(1)"""
+        if self.tail is None:
+            raise IndexError("pop from an empty list")
+        node = self.tail
+        self.remove(node)
+        return node.data
+
+    def popleft(self):
+        """Метод для удаления и возврата первого элемента списка за O(1)"""
+        if self.head is None:
+            raise IndexError("pop from an empty list")
+        node = self.head
+        self.remove(node)
+        return node.data
+
+    def remove(self, node):
+        """
+        Метод для удаления узла этого списка за O(1): соседи узла ссылаются друг на друга.
+        ValueError, если узел уже удален или является крайним узлом другого списка.
+        Узел из середины другого списка за O(1) не отличить от своего, такой узел передавать нельзя
+        """
+        if (node.prev is None and node is not self.head) or (node.next is None and node is not self.tail):
+            raise ValueError("node is not in this list")
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        node.prev = node.next = None
+        self.size -= 1
+
+    def __reversed__(self):
+        current = self.tail
+        while current:
+            yield current.data
+            current = current.prev
+
+class Block:
+    """Класс блока развернутого связного списка"""
+    __slots__ = ('items', 'next', 'prev')
+
+    def __init__(self, items=None):
+        self.items = items if items is not None else []  # Элементы блока, не больше block_size
+        self.next = None  # Ссылка на следующий блок
+        self.prev = None  # Ссылка на предыдущий блок
+
+class UnrolledLinkedList:
+    """Класс развернутого связного списка: двусвязный список блоков с элементами"""
+    def __init__(self, block_size=64):
+        if block_size < 2:
+            raise ValueError("block_size must be at least 2")  # Иначе половины делящегося блока не заполнить
+        self.block_size = block_size
+        self.head = self.tail = Block()  # В списке всегда есть хотя бы один, возможно пустой, блок
+        self.size = 0
+
+    def append(self, data):
+        """Метод для добавления элемента в конец списка за O(1)"""
+        if len(self.tail.items) == self.block_size:
+            self._link_after(self.tail, Block())
+        self.tail.items.append(data)
+        self.size += 1
+
+    def cursor(self, index=0):
+        """Курсор на элемент с номером index (index == len - позиция после последнего), поиск за O(n / block_size)"""
+        if not 0 <= index <= self.size:
+            raise IndexError("list index out of range")
+        block = self.head
+        while index > len(block.items) or (index == len(block.items) and block.next is not None):
+            index -= len(block.items)
+            block = block.next
+        return UnrolledCursor(self, block, index)
+
+    def insert(self, index, data):
+        """Метод для вставки элемента перед элементом с номером index"""
+        self.cursor(index).insert(data)
+
+    def __getitem__(self, index):
+        return self.cursor(index).value
+
+    def __iter__(self):
+        # Элементы внутри блока перебирает chain на C, код на Python выполняется только раз на блок
+        return chain.from_iterable(self._blocks_items())
+
+    def __len__(self):
+        return self.size
+
+    def display(self):
+        """Метод для отображения элементов списка"""
+        print("Список:", list(self))
+
+    def _blocks_items(self):
+        """Генератор массивов элементов блоков по порядку"""
+        block = self.head
+        while block:
+            yield block.items
+            block = block.next
+
+    def _link_after(self, block, new_block):
+        """Вставляет новый блок после block"""
+        new_block.prev = block
+        new_block.next = block.next
+        if block.next is None:
+            self.tail = new_block
+        else:
+            block.next.prev = new_block
+        block.next = new_block
+
+    def _unlink(self, block):
+        """Удаляет блок из цепочки"""
+        if block.prev is None:
+            self.head = block.next
+        else:
+            block.prev.next = block.next
+        if block.next is None:
+            self.tail = block.prev
+        else:
+            block.next.prev = block.prev
+
+class UnrolledCursor:
+    """
+    Класс курсора развернутого связного списка: блок и номер элемента в нем.
+    После изменения списка не через этот курсор курсор нужно получить заново методом cursor
+    """
+    __slots__ = ('container', 'block', 'offset')
+
+    def __init__(self, container, block, offset):
+        self.container = container
+        self.block = block
+        self.offset = offset
+
+    @property
+    def value(self):
+        """Элемент под курсором"""
+        if self.offset == len(self.block.items):
+            raise IndexError("cursor is at the end of the list")
+        return self.block.items[self.offset]
+
+    def at_end(self):
+        """Стоит ли курсор после последнего элемента"""
+        return self.offset == len(self.block.items)
+
+    def move(self, steps=1):
+        """Сдвигает курсор на steps элементов вперед (отрицательное steps - назад)"""
+        block, offset = self.block, self.offset + steps
+        while offset < 0 and block.prev is not None:
+            block = block.prev
+            offset += len(block.items)
+        while offset > len(block.items) or (offset == len(block.items) and block.next is not None):
+            if block.next is None:
+                break
+            offset -= len(block.items)
+            block = block.next
+        if not 0 <= offset <= len(block.items):
+            raise IndexError("cursor moved out of the list")
+        self.block, self.offset = block, offset
+
+    def insert(self, data):
+        """Вставляет элемент перед курсором, курсор указывает на новый элемент"""
+        container = self.container
+        block = self.block
+        if len(block.items) == container.block_size:
+            # Полный блок делится пополам
+            half = len(block.items) // 2
+            container._link_after(block, Block(block.items[half:]))
+            del block.items[half:]
+            if self.offset > half:
+                self.block = block = block.next
+                self.offset -= half
+        block.items.insert(self.offset, data)
+        container.size += 1
+
+    def remove(self):
+        """Удаляет и возвращает элемент под курсором, курсор указывает на следующий элемент"""
+        container = self.container
+        block = self.block
+        data = self.value
+        del block.items[self.offset]
+        container.size -= 1
+
+        next_block = block.next
+        if next_block is not None and len(block.items) < container.block_size // 2:
+            # Блок заполнен меньше чем наполовину: сливаем со следующим, если тот помещается в этот блок,
+            # иначе забираем один элемент из следующего - в нем больше половины блока, и он не станет неполным
+            if len(block.items) + len(next_block.items) <= container.block_size:
+                block.items.extend(next_block.items)
+                container._unlink(next_block)
+            else:
+                block.items.append(next_block.items.pop(0))
+        elif not block.items and block.prev is not None:
+            # Опустел последний блок списка
+            container._unlink(block)
+            self.block = block.prev
+            self.offset = len(block.prev.items)
+        if self.offset == len(self.block.items) and self.block.next is not None:
+            self.block = self.block.next
+            self.offset = 0
+        return data
 
 # Пример использования
-linked_list = LinkedList()
-linked_list.append(1)
-linked_list.append(2)
-linked_list.append(3)
-linked_list.display()  # Вывод: Список: [1, 2, 3]
+if __name__ == "__main__":
+    import sys
+    import time
+    from collections import deque
+
+    linked_list = LinkedList()
+    linked_list.append(1)
+    linked_list.append(2)
+    linked_list.append(3)
+    linked_list.display()  # Вывод: Список: [1, 2, 3]
+
+    doubly_linked_list = DoublyLinkedList()
+    nodes = [doubly_linked_list.append(value) for value in range(1, 6)]
+    doubly_linked_list.appendleft(0)
+    doubly_linked_list.remove(nodes[2])
+    print(doubly_linked_list.pop(), doubly_linked_list.popleft(), len(doubly_linked_list))  # Вывод: 5 0 3
+    doubly_linked_list.display()  # Вывод: Список: [1, 2, 4]
+
+    # Развернутый связный список
+    unrolled_list = UnrolledLinkedList(block_size=4)
+    for value in range(10):
+        unrolled_list.append(value)
+    cursor = unrolled_list.cursor(5)
+    cursor.insert('a')
+    cursor.move(2)
+    print(cursor.remove(), len(unrolled_list))  # Вывод: 6 10
+    unrolled_list.display()  # Вывод: Список: [0, 1, 2, 3, 4, 'a', 5, 7, 8, 9]
+
+    # Сравнение с collections.deque и list
+    count = 10 ** 6
+    for name, make, add in (("LinkedList", LinkedList, LinkedList.append),
+                            ("DoublyLinkedList", DoublyLinkedList, DoublyLinkedList.append),
+                            ("deque", deque, deque.append), ("list", list, list.append)):
+        start_time = time.time()
+        sequence = make()
+        for value in range(count):
+            add(sequence, value)
+        elapsed_time = time.time() - start_time
+        print(f'{name}: добавление в конец {count} элементов. Время в мс:{elapsed_time * 1000:.4f}')
+
+    count = 10 ** 5
+    for name, make, take in (("DoublyLinkedList", DoublyLinkedList, DoublyLinkedList.popleft),
+                             ("deque", deque, deque.popleft), ("list", list, lambda sequence: sequence.pop(0))):
+        sequence = make()
+        for value in range(count):
+            sequence.append(value)
+        start_time = time.time()
+        while len(sequence):
+            take(sequence)
+        elapsed_time = time.time() - start_time
+        print(f'{name}: удаление из начала {count} элементов. Время в мс:{elapsed_time * 1000:.4f}')
+
+    # Удаление из середины элементов, на которые уже есть ссылки (например, из словаря значение -> узел)
+    removals = 10 ** 3
+    doubly_linked_list = DoublyLinkedList()
+    nodes = [doubly_linked_list.append(value) for value in range(count)]
+    start_time = time.time()
+    for value in range(count // 2, count // 2 + removals):
+        doubly_linked_list.remove(nodes[value])
+    elapsed_time = time.time() - start_time
+    print(f'DoublyLinkedList: удаление {removals} известных узлов из середины. Время в мс:{elapsed_time * 1000:.4f}')
+
+    for name, make in (("deque", deque), ("list", list)):
+        sequence = make(range(count))
+        start_time = time.time()
+        for value in range(count // 2, count // 2 + removals):
+            sequence.remove(value)
+        elapsed_time = time.time() - start_time
+        print(f'{name}: удаление {removals} значений из середины. Время в мс:{elapsed_time * 1000:.4f}')
+
+    # Развернутый связный список
+    count = 10 ** 6
+    sequences = {}
+    for name, make in (("LinkedList", LinkedList), ("UnrolledLinkedList", UnrolledLinkedList), ("list", list)):
+        start_time = time.time()
+        sequence = make()
+        for value in range(count):
+            sequence.append(value)
+        elapsed_time = time.time() - start_time
+        sequences[name] = sequence
+        print(f'{name}: добавление в конец {count} элементов. Время в мс:{elapsed_time * 1000:.4f}')
+
+    for name, sequence in sequences.items():
+        start_time = time.time()
+        total = sum(sequence)
+        elapsed_time = time.time() - start_time
+        print(f'{name}: обход {count} элементов. Время в мс:{elapsed_time * 1000:.4f}')
+
+    # Память без учета самих элементов: узлы и блоки со ссылками на элементы
+    linked_bytes = 0
+    node = sequences["LinkedList"].head
+    while node:
+        linked_bytes += sys.getsizeof(node)
+        node = node.next
+    unrolled_bytes = 0
+    block = sequences["UnrolledLinkedList"].head
+    while block:
+        unrolled_bytes += sys.getsizeof(block) + sys.getsizeof(block.items)
+        block = block.next
+    list_bytes = sys.getsizeof(sequences["list"])
+    print(f'Байт на элемент: LinkedList {linked_bytes / count:.1f}, UnrolledLinkedList {unrolled_bytes / count:.1f}, '
+          f'list {list_bytes / count:.1f}')
+
+    inserts = 10 ** 4
+    start_time = time.time()
+    cursor = sequences["UnrolledLinkedList"].cursor(count // 2)
+    for value in range(inserts):
+        cursor.insert(value)
+    elapsed_time = time.time() - start_time
+    print(f'UnrolledLinkedList: вставка {inserts} элементов в середину у курсора. Время в мс:{elapsed_time * 1000:.4f}')
 
+    start_time = time.time()
+    for value in range(inserts):
+        sequences["list"].insert(count // 2, value)
+    elapsed_time = time.time() - start_time
+    print(f'list: вставка {inserts} элементов в середину. Время в мс:{elapsed_time * 1000:.4f}')
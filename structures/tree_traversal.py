@@ -0,0 +1,92 @@
+# Обходы бинарного дерева генераторами, общие для BinaryTree (binary_tree.py) и BinarySearchTree
+# (binary_search_tree.py). Функции принимают корень дерева - любой узел с полями key, left и right.
+# Ключи выдаются по одному, без рекурсии и без построения списка, поэтому обход можно прервать в любой момент,
+# а глубина дерева не ограничена глубиной рекурсии Python.
+
+
+def iter_inorder_nodes(root):
+    """Генератор узлов inorder обхода (Левый потомок, Корень, Правый потомок), стек вместо рекурсии"""
+    stack = []
+    node = root
+    while stack or node is not None:
+        if node is not None:
+            stack.append(node)
+            node = node.left
+        else:
+            node = stack.pop()
+            yield node
+            node = node.right
+
+
+def iter_inorder(root):
+    """Генератор ключей inorder обхода"""
+    for node in iter_inorder_nodes(root):
+        yield node.key
+
+
+def iter_preorder(root):
+    """Генератор ключей preorder обхода (Корень, Левый потомок, Правый потомок), стек вместо рекурсии"""
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        yield node.key
+        # Правый потомок кладется первым, чтобы левый был взят раньше
+        if node.right is not None:
+            stack.append(node.right)
+        if node.left is not None:
+            stack.append(node.left)
+
+
+def iter_postorder(root):
+    """Генератор ключей postorder обхода (Левый потомок, Правый потомок, Корень), стек вместо рекурсии"""
+    stack = []
+    last = None  # Последний выданный узел
+    node = root
+    while stack or node is not None:
+        if node is not None:
+            stack.append(node)
+            node = node.left
+        else:
+            top = stack[-1]
+            # В правое поддерево идем, только если еще не возвращались из него
+            if top.right is not None and top.right is not last:
+                node = top.right
+            else:
+                yield top.key
+                last = stack.pop()
+
+
+def iter_morris_inorder(root):
+    """
+    Генератор ключей inorder обхода Морриса с O(1) дополнительной памяти.
+    Вместо стека обход временно ставит в пустую правую ссылку узла-предшественника ссылку на узел,
+    к которому нужно вернуться. Если генератор закрыт раньше конца, обход доходит до конца без выдачи
+    ключей и убирает эти ссылки. Дерево нельзя изменять, пока обход не закончен.
+    """
+    walk = _morris_nodes(root)
+    try:
+        for node in walk:
+            yield node.key
+    finally:
+        for _ in walk:
+            pass
+
+
+def _morris_nodes(root):
+    """Генератор узлов обхода Морриса"""
+    node = root
+    while node is not None:
+        if node.left is None:
+            yield node
+            node = node.right
+            continue
+        predecessor = node.left
+        while predecessor.right is not None and predecessor.right is not node:
+            predecessor = predecessor.right
+        if predecessor.right is None:
+            predecessor.right = node  # Временная ссылка для возврата к узлу
+            node = node.left
+        else:
+            predecessor.right = None  # Левое поддерево пройдено, ссылка больше не нужна
+            yield node
+            node = node.right
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Папки structures и graphs импортируются из корня репозитория
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from graphs.contraction_hierarchies import ContractionHierarchy
+from graphs.djkstra import Graph, dijkstra_heap
+
+
+def grid_graph(side, seed):
+    rnd = random.Random(seed)
+    nodes = [(x, y) for x in range(side) for y in range(side)]
+    init_graph = {node: {} for node in nodes}
+    for x, y in nodes:
+        for neighbor in ((x + 1, y), (x, y + 1)):
+            if neighbor in init_graph:
+                init_graph[(x, y)][neighbor] = rnd.randint(1, 100)
+    return Graph(nodes, init_graph)
+
+
+def check_distances(graph, hierarchy, sources):
+    for source in sources:
+        _, expected = dijkstra_heap(graph, source)
+        for target in graph.get_nodes():
+            assert hierarchy.distance(source, target) == expected[target]
+
+
+def test_distances_match_dijkstra():
+    graph = grid_graph(12, seed=1)
+    hierarchy = ContractionHierarchy.build(graph)
+    check_distances(graph, hierarchy, [(0, 0), (5, 7), (11, 3)])
+    value, route = hierarchy.shortest_path((0, 0), (11, 11))
+    assert value == sum(graph.value(u, w) for u, w in zip(route, route[1:]))
+
+
+@pytest.mark.parametrize("relabel", [False, True])
+def test_save_load_round_trip(tmp_path, relabel):
+    graph = grid_graph(8, seed=2)
+    if relabel:
+        # Целые метки хранятся массивом int64, а не текстом
+        numbers = {node: i for i, node in enumerate(graph.get_nodes())}
+        init_graph = {numbers[u]: {numbers[w]: graph.value(u, w) for w in graph.get_outgoing_edges(u)}
+                      for u in graph.get_nodes()}
+        graph = Graph(list(init_graph), init_graph)
+    hierarchy = ContractionHierarchy.build(graph)
+    path = tmp_path / 'hierarchy.bin'
+    hierarchy.save(path)
+    loaded = ContractionHierarchy.load(path)
+    assert loaded.labels == hierarchy.labels
+    for name in ('offsets', 'targets', 'weights', 'middles'):
+        assert getattr(loaded, name) == getattr(hierarchy, name)
+    check_distances(graph, loaded, list(graph.get_nodes())[:3])
+
+
+def test_load_rejects_bad_files(tmp_path):
+    hierarchy = ContractionHierarchy.build(grid_graph(4, seed=3))
+    path = tmp_path / 'hierarchy.bin'
+    hierarchy.save(path)
+    data = path.read_bytes()
+    for broken in (data[:-1], data[:30], b'PK' + data[2:]):
+        path.write_bytes(broken)
+        with pytest.raises(ValueError):
+            ContractionHierarchy.load(path)
+
+
+def test_save_rejects_non_literal_labels(tmp_path):
+    hierarchy = ContractionHierarchy.build(grid_graph(3, seed=4))
+    hierarchy.labels = [object() for _ in hierarchy.labels]
+    with pytest.raises(TypeError):
+        hierarchy.save(tmp_path / 'hierarchy.bin')
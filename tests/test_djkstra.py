@@ -0,0 +1,29 @@
+import sys
+
+from graphs.djkstra import Graph, a_star, dijkstra_algorithm, random_graph, zero_heuristic
+
+
+def test_a_star_inconsistent_admissible_heuristic():
+    # Эвристика допустима (не больше настоящего расстояния до G), но не согласована на ребре S-A:
+    # узел C сначала раскрывается по пути через B, а потом находится более короткий путь через A
+    nodes = ["S", "A", "B", "C", "G"]
+    init_graph = {node: {} for node in nodes}
+    init_graph["S"]["A"] = 1
+    init_graph["S"]["B"] = 2
+    init_graph["A"]["C"] = 1
+    init_graph["B"]["C"] = 1
+    init_graph["C"]["G"] = 5
+    graph = Graph(nodes, init_graph)
+    estimates = {"A": 6}
+
+    _, path_values, _ = a_star(graph, "S", "G", lambda node, target: estimates.get(node, 0))
+    assert path_values["G"] == dijkstra_algorithm(graph, "S")[1]["G"] == 7
+
+
+def test_a_star_zero_heuristic_matches_dijkstra():
+    graph = random_graph(200, 3, seed=1)
+    _, expected = dijkstra_algorithm(graph, "N0")
+    for target in ("N50", "N120", "N199"):
+        _, path_values, _ = a_star(graph, "N0", target, zero_heuristic)
+        if expected[target] != sys.maxsize:
+            assert path_values[target] == expected[target]
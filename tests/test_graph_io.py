@@ -0,0 +1,64 @@
+import pytest
+
+from graphs.graph_io import HEADER, MappedGraph, convert_edge_list, load_edge_list, read_edge_list
+
+
+def write(tmp_path, text):
+    path = tmp_path / 'edges.txt'
+    path.write_text(text)
+    return path
+
+
+def test_read_edge_list_values(tmp_path):
+    path = write(tmp_path, "# comment\na b\n\na c 5\nb c 2.5\nc d 1e2\n")
+    assert list(read_edge_list(path)) == [('a', 'b', 1), ('a', 'c', 5), ('b', 'c', 2.5), ('c', 'd', 100.0)]
+    nodes, init_graph = load_edge_list(path)
+    assert nodes == ['a', 'b', 'c', 'd'] and init_graph['a'] == {'b': 1, 'c': 5}
+
+
+@pytest.mark.parametrize("line", ["a", "a b inf", "a b nan", "a b 1e999", "a b x"])
+def test_read_edge_list_rejects_bad_line(tmp_path, line):
+    path = write(tmp_path, f"a b 1\n# comment\n{line}\n")
+    with pytest.raises(ValueError, match="line 3"):
+        list(read_edge_list(path))
+
+
+def binary_graph(tmp_path):
+    text_path = write(tmp_path, "0 1 4\n1 2 3\n2 0 5\n")
+    binary_path = tmp_path / 'graph.bin'
+    convert_edge_list(text_path, binary_path)
+    return binary_path
+
+
+def test_convert_and_map(tmp_path):
+    graph = MappedGraph(binary_graph(tmp_path))
+    try:
+        assert [graph[vertex] for vertex in graph] == [[1, 2], [0, 2], [1, 0]]
+        assert sorted(graph.neighbors(1)) == [(0, 4), (2, 3)]
+    finally:
+        graph.close()
+
+
+@pytest.mark.parametrize("text", ["0 1\n-1 2 4\n", "0 1\na 2\n", "0 1\n1 2.5\n"])
+def test_convert_rejects_bad_vertices(tmp_path, text):
+    with pytest.raises(ValueError, match="line 2"):
+        convert_edge_list(write(tmp_path, text), tmp_path / 'graph.bin')
+
+
+@pytest.mark.parametrize("size", [10, 40, 80, 85, -1])
+def test_mapped_graph_rejects_truncated_file(tmp_path, size):
+    path = binary_graph(tmp_path)
+    path.write_bytes(path.read_bytes()[:size])
+    with pytest.raises(ValueError):
+        MappedGraph(path)
+
+
+@pytest.mark.parametrize("field, value", [(0, b'XXXX'), (1, b'x'), (3, -1), (4, -1), (4, 10 ** 6)])
+def test_mapped_graph_rejects_bad_header(tmp_path, field, value):
+    path = binary_graph(tmp_path)
+    data = path.read_bytes()
+    header = list(HEADER.unpack_from(data))
+    header[field] = value
+    path.write_bytes(HEADER.pack(*header) + data[HEADER.size:])
+    with pytest.raises(ValueError):
+        MappedGraph(path)
@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from structures.linked_list import DoublyLinkedList, UnrolledLinkedList
+
+
+def test_remove_node_twice():
+    doubly_linked_list = DoublyLinkedList()
+    nodes = [doubly_linked_list.append(value) for value in range(3)]
+    doubly_linked_list.remove(nodes[1])
+    with pytest.raises(ValueError):
+        doubly_linked_list.remove(nodes[1])
+    doubly_linked_list.remove(nodes[2])
+    with pytest.raises(ValueError):
+        doubly_linked_list.remove(nodes[2])
+    assert list(doubly_linked_list) == [0]
+    assert len(doubly_linked_list) == 1
+
+
+def test_remove_foreign_node():
+    doubly_linked_list = DoublyLinkedList()
+    other = DoublyLinkedList()
+    doubly_linked_list.append(1)
+    doubly_linked_list.append(2)
+    first = other.append(3)
+    last = other.append(4)
+    for node in (first, last):
+        with pytest.raises(ValueError):
+            doubly_linked_list.remove(node)
+    assert list(doubly_linked_list) == [1, 2]
+    assert len(doubly_linked_list) == 2
+    assert list(other) == [3, 4]
+
+
+def test_remove_keeps_order_and_size():
+    doubly_linked_list = DoublyLinkedList()
+    nodes = [doubly_linked_list.append(value) for value in range(5)]
+    doubly_linked_list.remove(nodes[0])
+    doubly_linked_list.remove(nodes[4])
+    doubly_linked_list.remove(nodes[2])
+    assert list(doubly_linked_list) == [1, 3]
+    assert list(reversed(doubly_linked_list)) == [3, 1]
+    assert len(doubly_linked_list) == 2
+    assert doubly_linked_list.popleft() == 1
+    assert doubly_linked_list.pop() == 3
+    assert doubly_linked_list.head is None and doubly_linked_list.tail is None
+
+
+def check_blocks(unrolled_list, values):
+    "Элементы совпадают с values, все блоки, кроме последнего, заполнены хотя бы наполовину"
+    assert list(unrolled_list) == values
+    assert len(unrolled_list) == len(values)
+    block = unrolled_list.head
+    while block is not None:
+        assert len(block.items) <= unrolled_list.block_size
+        if block is not unrolled_list.tail:
+            assert len(block.items) >= unrolled_list.block_size // 2
+            assert block.next.prev is block
+        block = block.next
+
+
+@pytest.mark.parametrize("block_size", [2, 3, 8, 64])
+def test_unrolled_fill_after_removals(block_size):
+    rnd = random.Random(block_size)
+    unrolled_list = UnrolledLinkedList(block_size)
+    values = list(range(2000))
+    for value in values:
+        unrolled_list.append(value)
+    # Удаления в случайных местах, в том числе почти всех элементов
+    while len(values) > 10:
+        index = rnd.randrange(len(values))
+        assert unrolled_list.cursor(index).remove() == values.pop(index)
+        if len(values) % 97 == 0:
+            check_blocks(unrolled_list, values)
+    check_blocks(unrolled_list, values)
+
+
+def test_unrolled_cursor_sequential_removals():
+    unrolled_list = UnrolledLinkedList(64)
+    values = list(range(6400))
+    for value in values:
+        unrolled_list.append(value)
+    # Удаление почти всех элементов одним курсором, как в отчете: в каждом блоке оставался один элемент
+    cursor = unrolled_list.cursor(0)
+    for value in range(6400):
+        if value % 64:
+            assert cursor.remove() == value
+        else:
+            cursor.move()
+    check_blocks(unrolled_list, list(range(0, 6400, 64)))
+    blocks = 0
+    block = unrolled_list.head
+    while block is not None:
+        blocks += 1
+        block = block.next
+    assert blocks <= 2 * len(unrolled_list) // 64 + 1
+
+
+def test_unrolled_cursor_insert_and_remove():
+    rnd = random.Random(1)
+    unrolled_list = UnrolledLinkedList(4)
+    values = []
+    for _ in range(3000):
+        index = rnd.randrange(len(values) + 1)
+        value = rnd.random()
+        unrolled_list.insert(index, value)
+        values.insert(index, value)
+        if rnd.random() < 0.45 and values:
+            index = rnd.randrange(len(values))
+            assert unrolled_list.cursor(index).remove() == values.pop(index)
+    check_blocks(unrolled_list, values)
@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+import graphs
+from graphs.parallel_levels import SharedCSR, parallel_bfs, sequential_levels
+
+
+def test_package_exports_function_not_module():
+    assert graphs.parallel_bfs is parallel_bfs
+
+
+@pytest.mark.parametrize("direction", ["top-down", "auto"])
+def test_parallel_matches_sequential(direction):
+    rnd = random.Random(5)
+    count = 2000
+    graph = {vertex: [] for vertex in range(count)}
+    for _ in range(count * 3):
+        u, v = rnd.randrange(count), rnd.randrange(count)
+        graph[u].append(v)
+        graph[v].append(u)
+    shared_graph = SharedCSR.from_adjacency(graph)
+    try:
+        expected = sequential_levels(shared_graph, 0)
+        assert list(parallel_bfs(shared_graph, 0, workers=2, direction=direction, chunk_size=64)) == expected
+    finally:
+        shared_graph.close()
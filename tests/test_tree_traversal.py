@@ -0,0 +1,99 @@
+import gc
+import random
+
+import pytest
+
+from structures.binary_search_tree import AVLTree
+from structures.binary_tree import BinaryTree, TreeNode
+from structures.tree_traversal import iter_inorder, iter_morris_inorder, iter_postorder, iter_preorder
+
+
+def random_tree(rnd, count):
+    "Случайное по форме дерево из count узлов"
+    if count == 0:
+        return None
+    node = TreeNode(rnd.randrange(100))
+    left_count = rnd.randrange(count)
+    node.left = random_tree(rnd, left_count)
+    node.right = random_tree(rnd, count - 1 - left_count)
+    return node
+
+
+def recursive_orders(node, inorder, preorder, postorder):
+    if node is not None:
+        preorder.append(node.key)
+        recursive_orders(node.left, inorder, preorder, postorder)
+        inorder.append(node.key)
+        recursive_orders(node.right, inorder, preorder, postorder)
+        postorder.append(node.key)
+
+
+def test_traversals_match_recursive():
+    rnd = random.Random(3)
+    for count in range(40):
+        root = random_tree(rnd, count)
+        inorder, preorder, postorder = [], [], []
+        recursive_orders(root, inorder, preorder, postorder)
+        assert list(iter_inorder(root)) == inorder
+        assert list(iter_morris_inorder(root)) == inorder
+        assert list(iter_preorder(root)) == preorder
+        assert list(iter_postorder(root)) == postorder
+
+
+def test_morris_restores_tree_when_closed_early():
+    rnd = random.Random(4)
+    root = random_tree(rnd, 30)
+    preorder = list(iter_preorder(root))
+    traversal = iter_morris_inorder(root)
+    for _ in range(10):
+        next(traversal)
+    traversal.close()
+    assert list(iter_preorder(root)) == preorder
+
+
+def test_tree_methods_use_shared_traversals():
+    tree = BinaryTree()
+    for key in range(1, 6):
+        tree.insert(key)
+    assert list(tree.iter_inorder()) == [4, 2, 5, 1, 3]
+    assert list(tree.iter_preorder()) == [1, 2, 4, 5, 3]
+    assert list(tree.iter_postorder()) == [4, 5, 2, 3, 1]
+    avl = AVLTree.bulk_load([5, 3, 8, 1])
+    assert list(avl) == list(avl.iter_morris_inorder()) == [1, 3, 5, 8]
+
+
+def test_load_rejects_truncated_files(tmp_path):
+    tree = BinaryTree()
+    for key in range(10):
+        tree.insert(key)
+    path = tmp_path / 'tree.bin'
+    tree.save(path)
+    assert list(BinaryTree.load(path).iter_inorder()) == list(tree.iter_inorder())
+    data = path.read_bytes()
+    for size in (len(data) - 1, 20, 5):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            BinaryTree.load(path)
+
+    avl = AVLTree.bulk_load(range(10))
+    avl.save(path)
+    assert list(AVLTree.load(path)) == list(range(10))
+    data = path.read_bytes()
+    for size in (len(data) - 1, 5):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            AVLTree.load(path)
+
+
+def test_load_restores_gc_state(tmp_path):
+    path = tmp_path / 'tree.bin'
+    AVLTree.bulk_load(range(10)).save(path)
+    assert gc.isenabled()
+    AVLTree.load(path)
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        AVLTree.load(path)
+        assert not gc.isenabled()
+    finally:
+        gc.enable()